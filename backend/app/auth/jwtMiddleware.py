@@ -3,6 +3,7 @@ from django.conf import settings
 from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
 from asgiref.sync import sync_to_async 
+from .user_cache import user_cache, UserPrincipal
 
 
 User = get_user_model()
@@ -11,9 +12,12 @@ def user_id_from_token(token):
 	try:
 		token = AccessToken(token, False)
 		user_id = token.payload['user_id']
-		return user_id
+		return user_id, token.payload.get('jti')
 	except:
-		return -1
+		return -1, None
+
+def get_user_principal(user_id):
+	return UserPrincipal.from_user(User.objects.only('id', 'username').get(id=user_id))
 
 def get_token_from_query_params(query_params):
 	query_params = query_params.decode('utf-8')
@@ -29,7 +33,7 @@ class JwtAuthMiddleware(BaseMiddleware):
 
 	async def __call__(self, scope, receive, send):
 		token = get_token_from_query_params(scope['query_string'])
-		user_id = user_id_from_token(token)
+		user_id, jti = user_id_from_token(token)
 		if user_id == -1:
 			scope['error'] = 'Invalid token'
 			return await super().__call__(scope, receive, send)
@@ -38,7 +42,10 @@ class JwtAuthMiddleware(BaseMiddleware):
 		scope['user'] = None
 		try:
 			# Check if the token is valid
-			user = await sync_to_async(User.objects.get)(id=user_id)  
+			user = user_cache.get(user_id, jti)
+			if user is None:
+				user = await sync_to_async(get_user_principal)(user_id)
+				user_cache.set(user_id, jti, user)
 			scope['user'] = user
 		except User.DoesNotExist:
 			scope['error'] = 'Invalid token'
@@ -0,0 +1,70 @@
+import time
+import threading
+from collections import OrderedDict
+from django.conf import settings
+
+class UserPrincipal:
+    """
+    Lightweight stand-in for the user model in WebSocket scopes.
+    Carries only what the consumers read: id/pk, username and the authentication flags.
+    """
+    __slots__ = ('id', 'username')
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username)
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        return self.username
+
+class UserPrincipalCache:
+    """
+    Bounded, short-lived in-process cache of UserPrincipal keyed by (user id, token jti).
+    Entries expire after WS_USER_CACHE_TTL seconds and are dropped on user update or deletion
+    (see app.users.signals). Other processes only see a change once their entry expires.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, jti):
+        with self._lock:
+            entry = self._entries.get((user_id, jti))
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del self._entries[(user_id, jti)]
+                return None
+            self._entries.move_to_end((user_id, jti))
+            return principal
+
+    def set(self, user_id, jti, principal):
+        with self._lock:
+            self._entries[(user_id, jti)] = (time.monotonic() + settings.WS_USER_CACHE_TTL, principal)
+            self._entries.move_to_end((user_id, jti))
+            while len(self._entries) > settings.WS_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+user_cache = UserPrincipalCache()
@@ -0,0 +1,187 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .physics import PRECISION
+
+BALL_SIZE = 0.02
+PADDLE_WIDTH = 0.02
+PADDLE_HEIGHT = 0.25
+PADDLE_X = (0, 1 - 0.02)
+MAX_ANGLE = math.pi/4
+
+class BatchPhysics:
+    """
+    Array-backed physics engine that steps every game of the process at once.
+    Ball and paddle state is stored in contiguous NumPy arrays (one row per game) and updated with
+    vectorized operations that mirror Ball.update, Paddle.update, Hitbox.collides and
+    Ball.calculate_angle, so a batched game evolves exactly like a scalar one.
+    """
+    def __init__(self, capacity: int = 64):
+        self.slots = {}
+        self.games = {}
+        self.free = []
+        self.size = 0
+        self.multiplier = 10 ** PRECISION
+        self._allocate(capacity)
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.ball_x = np.zeros(capacity)
+        self.ball_y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.paddle_y = np.zeros((capacity, 2))
+        self.paddle_moving = np.zeros((capacity, 2))
+        self.resume_at = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = (self.ball_x, self.ball_y, self.speed_x, self.speed_y, self.paddle_y, self.paddle_moving, self.resume_at, self.active)
+        self._allocate(self.capacity * 2)
+        new = (self.ball_x, self.ball_y, self.speed_x, self.speed_y, self.paddle_y, self.paddle_moving, self.resume_at, self.active)
+        for old_array, new_array in zip(old, new):
+            new_array[:len(old_array)] = old_array
+
+    def add(self, game):
+        if game in self.slots:
+            return
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+        self.slots[game] = slot
+        self.games[slot] = game
+        self.active[slot] = True
+        self.load(game)
+
+    def remove(self, game):
+        slot = self.slots.pop(game, None)
+        if slot is None:
+            return
+        del self.games[slot]
+        self.active[slot] = False
+        self.free.append(slot)
+
+    def load(self, game):
+        """Copies a game's ball and paddles into its row."""
+        slot = self.slots[game]
+        self.ball_x[slot] = game.ball.x
+        self.ball_y[slot] = game.ball.y
+        self.speed_x[slot] = game.ball.speed_x
+        self.speed_y[slot] = game.ball.speed_y
+        for side, paddle in enumerate(game.paddles):
+            self.paddle_y[slot, side] = paddle.y
+            self.paddle_moving[slot, side] = paddle.moving
+        self.resume_at[slot] = game.resume_at
+
+    def store(self, game):
+        """Copies a game's row back into its ball and paddles."""
+        slot = self.slots[game]
+        game.ball.x = float(self.ball_x[slot])
+        game.ball.y = float(self.ball_y[slot])
+        game.ball.speed_x = float(self.speed_x[slot])
+        game.ball.speed_y = float(self.speed_y[slot])
+        for side, paddle in enumerate(game.paddles):
+            paddle.y = float(self.paddle_y[slot, side])
+
+    def set_moving(self, game, side: int, moving: float):
+        slot = self.slots.get(game)
+        if slot is not None:
+            self.paddle_moving[slot, side] = moving
+
+    def _truncate(self, values):
+        return np.trunc(values * self.multiplier) / self.multiplier
+
+    def step(self, steps: int, dt: float, now: float):
+        """
+        Advances every active game by `steps` simulation steps.
+        Returns a list of (game, side) for the games in which `side` scored; those games stop
+        stepping for the rest of the tick, like Game.step does.
+        """
+        n = self.size
+        scorer = np.full(n, -1)
+        live = self.active[:n] & (self.resume_at[:n] <= now)
+
+        for _ in range(steps):
+            rows = np.flatnonzero(live & (scorer < 0))
+            if not rows.size:
+                break
+            self._update_balls(rows, dt)
+            self._update_paddles(rows, dt)
+            for side in (0, 1):
+                self._collide(rows, side)
+            self._score(rows, scorer)
+
+        return [(self.games[slot], int(scorer[slot])) for slot in np.flatnonzero(scorer >= 0)]
+
+    def _update_balls(self, rows, dt):
+        x = self._truncate(self.ball_x[rows] + self.speed_x[rows] * dt)
+        y = self._truncate(self.ball_y[rows] + self.speed_y[rows] * dt)
+        vy = self.speed_y[rows]
+
+        top = y <= 0
+        bottom = ~top & (y + BALL_SIZE >= 1)
+        y[top] = 0
+        vy[top] = np.abs(vy[top])
+        y[bottom] = 1 - BALL_SIZE
+        vy[bottom] = -np.abs(vy[bottom])
+
+        self.ball_x[rows] = x
+        self.ball_y[rows] = y
+        self.speed_y[rows] = vy
+
+    def _update_paddles(self, rows, dt):
+        y = self._truncate(self.paddle_y[rows] + self.paddle_moving[rows] * dt)
+        y[y < 0] = 0
+        y[y + PADDLE_HEIGHT > 1] = 1 - PADDLE_HEIGHT
+        self.paddle_y[rows] = y
+
+    def _collide(self, rows, side):
+        x = self.ball_x[rows]
+        y = self.ball_y[rows]
+        vx = self.speed_x[rows]
+        vy = self.speed_y[rows]
+        px = PADDLE_X[side]
+        py = self.paddle_y[rows, side]
+
+        overlaps_y = ((y > py) & (y < py + PADDLE_HEIGHT)) | \
+                     ((y + BALL_SIZE > py) & (y + BALL_SIZE < py + PADDLE_HEIGHT))
+        left_edge_inside = (x > px) & (x < px + PADDLE_WIDTH)
+        right_edge_inside = (x + BALL_SIZE > px) & (x + BALL_SIZE < px + PADDLE_WIDTH)
+        collides = (left_edge_inside | right_edge_inside) & overlaps_y
+
+        paddle_on_left = px + PADDLE_WIDTH / 2 < x + BALL_SIZE / 2
+        towards = np.where(paddle_on_left, vx < 0, vx > 0)
+
+        hit = np.flatnonzero(collides & towards)
+        if not hit.size:
+            return
+
+        impact = (y[hit] + BALL_SIZE/2 - (py[hit] + PADDLE_HEIGHT/2)) / (PADDLE_HEIGHT/2)
+        angle = impact * MAX_ANGLE
+        speed = np.sqrt(vx[hit]**2 + vy[hit]**2)
+        # Hits are rare, so the trigonometry uses math to stay bit-identical with Ball.calculate_angle.
+        cos = np.array([math.cos(a) for a in angle])
+        sin = np.array([math.sin(a) for a in angle])
+        direction = np.where(vx[hit] > 0, -1.0, 1.0)
+
+        self.speed_x[rows[hit]] = speed * cos * direction
+        self.speed_y[rows[hit]] = speed * sin
+
+    def _score(self, rows, scorer):
+        x = self.ball_x[rows]
+        left = x < PADDLE_X[0]
+        right = ~left & (x + BALL_SIZE > PADDLE_X[1] + PADDLE_WIDTH)
+        scorer[rows[left]] = 1
+        scorer[rows[right]] = 0
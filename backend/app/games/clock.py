@@ -0,0 +1,82 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TickJitter:
+    """
+    Tracks how late each tick fires compared to its scheduled time.
+    A jitter close to or above the step interval means the event loop is saturated.
+    """
+    def __init__(self, step_interval: float):
+        self.step_interval = step_interval
+        self.last: float = 0
+        self.max: float = 0
+        self.mean: float = 0
+        self.ticks: int = 0
+        self.late_ticks: int = 0
+
+    def record(self, lateness: float):
+        lateness = max(lateness, 0)
+        self.ticks += 1
+        self.last = lateness
+        self.max = max(self.max, lateness)
+        self.mean += (lateness - self.mean) / min(self.ticks, 100)
+        if lateness > self.step_interval:
+            self.late_ticks += 1
+
+    def as_dict(self):
+        return {
+            "last_ms": round(self.last * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "mean_ms": round(self.mean * 1000, 3),
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+        }
+
+class FixedTimestep:
+    """
+    Fixed-timestep scheduler on a monotonic clock.
+    Simulation steps run at `tick_rate` and catch up on missed steps (bounded by `max_catch_up`),
+    while network broadcasts run independently at `broadcast_rate`.
+    """
+    def __init__(self, tick_rate: int, broadcast_rate: int, max_catch_up: int = 5):
+        self.step_interval = 1 / tick_rate
+        self.broadcast_interval = 1 / broadcast_rate
+        self.max_catch_up = max_catch_up
+        self.jitter = TickJitter(self.step_interval)
+        self.start()
+
+    def start(self):
+        now = time.monotonic()
+        self.next_step = now
+        self.next_broadcast = now
+
+    def due_steps(self) -> int:
+        now = time.monotonic()
+        if now < self.next_step:
+            return 0
+        self.jitter.record(now - self.next_step)
+
+        steps = 0
+        while self.next_step <= now and steps < self.max_catch_up:
+            self.next_step += self.step_interval
+            steps += 1
+
+        if self.next_step <= now:
+            dropped = int((now - self.next_step) / self.step_interval) + 1
+            logger.warning(f"Game loop is saturated, dropping {dropped} simulation steps")
+            self.next_step = now + self.step_interval
+        return steps
+
+    def broadcast_due(self) -> bool:
+        now = time.monotonic()
+        if now < self.next_broadcast:
+            return False
+        self.next_broadcast += self.broadcast_interval
+        if self.next_broadcast <= now:
+            self.next_broadcast = now + self.broadcast_interval
+        return True
+
+    def time_until_next(self) -> float:
+        return max(0, min(self.next_step, self.next_broadcast) - time.monotonic())
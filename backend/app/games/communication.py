@@ -1,3 +1,5 @@
+import asyncio
+
 def truncate(n, decimals=0) -> float:
     multiplier = 10 ** decimals
     return int(n * multiplier) / multiplier
@@ -6,54 +8,86 @@ class GameCommunication:
     def __init__(self, game_instance):
         self.game = game_instance
         self.socket = game_instance.socket
+        self.outbox = []
+        self.seq = 0
+
+    def queue_game_state(self):
+        self.outbox.append(self._game_state())
+
+    def queue_score_update(self):
+        self.outbox.append(self._score())
+
+    async def flush(self):
+        messages, self.outbox = self.outbox, []
+        for objects in messages:
+            await self._group_send(objects)
 
     async def send_game_state(self):
-        await self.socket.channel_layer.group_send(
-            self.socket.db_game.channel_group_name,
-            {
-                "type": "state_update",
-                "objects": {
-                    "type": "gameState",
-                    "ball": self._get_ball_state(),
-                    "paddles": self._get_paddles_state()
-                }
-            }
-        )
+        await self._group_send(self._game_state())
 
     async def send_score_update(self):
-        await self.socket.channel_layer.group_send(
-            self.socket.db_game.channel_group_name,
-            {
-                "type": "state_update",
-                "objects": {
-                    "type": "score",
-                    "score": self.game.score
-                }
-            }
-        )
+        await self._group_send(self._score())
 
-    async def send_game_over(self):
-        await self.socket.channel_layer.group_send(
-            self.socket.db_game.channel_group_name,
-            {
-                "type": "state_update",
-                "objects": {
-                    "type": "endGame",
-                    "score": self.game.score
-                }
-            }
-        )
+    async def send_game_over(self, result_saved=None):
+        await self._group_send({
+            "type": "endGame",
+            "score": self.game.score
+        })
 
-        tournament_id = await self.game.db.get_tournament_id()
+        # The tournament consumers read the result from the database, so they are notified once it is written.
+        if result_saved:
+            await result_saved
+
+        tournament_id = self.game.snapshot.tournament_id
         if tournament_id:
             await self.socket.channel_layer.group_send(
                 f"tournament_{tournament_id}",
                 {
                     "type": "endGame",
-                    "game_id": self.socket.db_game.id,
+                    "game_id": self.game.snapshot.id,
                 }
             )
 
+    async def _group_send(self, objects):
+        local_consumers = self._local_consumers()
+        if local_consumers:
+            event = {"type": "state_update", "objects": objects}
+            await asyncio.gather(*(consumer.state_update(event) for consumer in local_consumers))
+            return
+
+        await self.socket.channel_layer.group_send(
+            self.game.snapshot.channel_group_name,
+            {
+                "type": "state_update",
+                "objects": objects
+            }
+        )
+
+    def _local_consumers(self):
+        """
+        Returns the players' consumers when both live in this process, so frames can skip the channel layer.
+        Otherwise the group may have members in other processes and the caller falls back to group_send.
+        """
+        consumers = [consumer for consumer in self.game.consumers.values() if consumer.is_connected]
+        if {consumer.side for consumer in consumers} == {0, 1}:
+            return consumers
+        return None
+
+    def _game_state(self):
+        self.seq += 1
+        return {
+            "type": "gameState",
+            "seq": self.seq,
+            "ball": self._get_ball_state(),
+            "paddles": self._get_paddles_state()
+        }
+
+    def _score(self):
+        return {
+            "type": "score",
+            "score": list(self.game.score)
+        }
+
     def _get_ball_state(self):
         return {
             "x": truncate(self.game.ball.x, 2),
@@ -69,4 +103,3 @@ class GameCommunication:
             }
             for paddle in self.game.paddles
         ]
-
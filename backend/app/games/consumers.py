@@ -1,18 +1,26 @@
 import json
+import time
 import asyncio
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from .game import Game
+from .scheduler import game_scheduler
+from .frames import FrameEncoder
+from .protocol import wants_binary, pack_game_state, unpack_input
 from .models import PongGame
+from .snapshot import GameSnapshot
+from .matchmaking import quick_match_queue, SEARCH_INTERVAL, NOT_QUEUED
+from app.users.models import GameStats
+from app.users.rating import INITIAL_RATING
 from channels.db import database_sync_to_async
-from django.utils import timezone
+
+logger = logging.getLogger(__name__)
 
 """
 
 Game Consumer
 
 """
-active_games = {}
-
 def create_group_name(game_id: int) -> str:
     return f"game_{game_id}"
 
@@ -24,39 +32,26 @@ class GameConsumer(AsyncWebsocketConsumer):
     update_lock = asyncio.Lock()
     side: int = 0
     is_connected = False
+    binary = False
 
     @database_sync_to_async
-    def get_player1(self, game: PongGame):
-        return game.player1
-
-    @database_sync_to_async
-    def get_player2(self, game: PongGame):
-        return game.player2
-
-    @database_sync_to_async
-    def get_channel_group_name(self, game: PongGame):
-        return game.channel_group_name
+    def load_snapshot(self, game_id):
+        return GameSnapshot.load(game_id)
 
     @database_sync_to_async
-    def game_has_winner(self, game: PongGame):
-        return game.winner is not None
-    
-    @database_sync_to_async
-    def get_game_id(self, game: PongGame):
-        return game.id
-    
-    @database_sync_to_async
-    def set_channel_group_name(self, game: PongGame, group_name: str):
-        game.channel_group_name = group_name
-        game.save()
+    def set_channel_group_name(self, snapshot: GameSnapshot, group_name: str):
+        PongGame.objects.filter(id=snapshot.id, channel_group_name='').update(channel_group_name=group_name)
+        return snapshot._replace(channel_group_name=group_name)
 
     async def connect(self):
         if "error" in self.scope:
             await self.handle_error(self.scope["error"])
             return
 
-        await self.accept()
+        self.binary, subprotocol = wants_binary(self.scope)
+        await self.accept(subprotocol=subprotocol)
         self.is_connected = True
+        self.frames = FrameEncoder()
 
         game_id = self.scope["url_route"]["kwargs"].get("game_id")
         user = self.scope["user"]
@@ -65,57 +60,58 @@ class GameConsumer(AsyncWebsocketConsumer):
             await self.handle_error("No game ID provided")
             return
 
-        await self.initialize_game(game_id)
-        await self.check_errors(user, game_id)
+        await self.initialize_game(game_id, user)
+        if not await self.check_errors(user, game_id):
+            return
         await self.setup_player(user)
         await self.setup_channel_group()
         await self.notify_player()
         await self.notify_oponent()
 
-    async def initialize_game(self, game_id):
-        if game_id not in active_games:
-            active_games[game_id] = Game()
-            active_games[game_id].players_ready = [False, False]
-            active_games[game_id].players_connected = [False, False]
-        self.game = active_games[game_id]
-        self.db_game = await database_sync_to_async(PongGame.objects.filter(id=game_id).first)()
+    async def initialize_game(self, game_id, user):
+        self.game = game_scheduler.get_or_create(game_id, Game)
+        if not self.game.snapshot or self.game.snapshot.side_of(user.id) is None:
+            snapshot = await self.load_snapshot(game_id)
+            if snapshot:
+                self.game.attach_snapshot(snapshot)
+        self.snapshot = self.game.snapshot
     
     async def check_errors(self, user, game_id):
-        if not self.game:
+        if not self.game or not self.snapshot:
             await self.handle_error("Game not found")
-            return
-        if not await self.is_valid_player(user):
+            return False
+        if self.snapshot.side_of(user.id) is None:
             await self.handle_error("You are not a player in this game")
-            return
-        if await self.game_has_winner(self.db_game):
+            return False
+        if self.game.finished or self.snapshot.winner_id is not None:
             await self.handle_error("Game is finished")
-            return
+            return False
+        return True
 
     async def handle_error(self, message):
         await self.accept()
         await self.send(text_data=json.dumps({"type": "error", "message": message}))
         await self.close()
 
-    async def is_valid_player(self, user):
-        return (await self.get_player1(self.db_game)) == user or (await self.get_player2(self.db_game)) == user
-
     async def setup_player(self, user):
-        self.side = 0 if (await self.get_player1(self.db_game)) == user else 1
+        self.side = self.snapshot.side_of(user.id)
         self.game.players_connected[self.side] = True
+        self.game.consumers[self.channel_name] = self
 
     async def setup_channel_group(self):
-        channel_group_name = await self.get_channel_group_name(self.db_game) or create_group_name(self.db_game.id)
-        await self.set_channel_group_name(self.db_game, channel_group_name)
+        if not self.snapshot.channel_group_name:
+            self.game.attach_snapshot(await self.set_channel_group_name(self.snapshot, create_group_name(self.snapshot.id)))
+            self.snapshot = self.game.snapshot
+        channel_group_name = self.snapshot.channel_group_name
         await self.channel_layer.group_add(channel_group_name, self.channel_name)
         self.game_group_name = channel_group_name
 
     async def notify_player(self):
         await self.send(text_data=json.dumps({"type": "connection_established", "side": self.side}))
         other_side = 1 if self.side == 0 else 0
-        other_player = await (self.get_player1(self.db_game) if other_side == 0 else self.get_player2(self.db_game))
 
         if self.game.players_connected[other_side]:
-            await self.send(text_data=json.dumps({"type": "player_connected", "player": other_player.username, "side": other_side}))
+            await self.send(text_data=json.dumps({"type": "player_connected", "player": self.snapshot.username(other_side), "side": other_side}))
             if self.game.players_ready[other_side]:
                 await self.send(text_data=json.dumps({"type": "player_ready", "side": other_side}))
 
@@ -126,47 +122,46 @@ class GameConsumer(AsyncWebsocketConsumer):
                 "type": "player_status",
                 "objects": {
                     "type": "player_connected",
-                    "player": self.scope["user"].username,
+                    "player": self.snapshot.username(self.side),
                     "side": self.side
                 }
             }
         )
 
     async def disconnect(self, close_code):
-        game_id = await self.get_game_id(self.db_game)
-        self.db_game = await database_sync_to_async(PongGame.objects.filter(id=game_id).first)()
+        if not self.game_group_name:
+            return
+
         self.is_connected = False
 
-        if self.game_group_name and hasattr(self, 'side'):
-            try:
-                await self.channel_layer.group_send(
-                    self.game_group_name,
-                    {
-                        "type": "player_status",
-                        "objects": {
-                            "type": "player_disconnected",
-                            "side": self.side,
-                        }
+        try:
+            await self.channel_layer.group_send(
+                self.game_group_name,
+                {
+                    "type": "player_status",
+                    "objects": {
+                        "type": "player_disconnected",
+                        "side": self.side,
                     }
-                )
-            except Exception:
-                pass
+                }
+            )
+        except Exception:
+            pass
 
-        if self.game_group_name:
-            await self.channel_layer.group_discard(self.game_group_name, self.channel_name)
+        await self.channel_layer.group_discard(self.game_group_name, self.channel_name)
 
-        if hasattr(self, 'game') and self.game:
-            await self.game.handle_disconnect()
+        self.game.consumers.pop(self.channel_name, None)
+        await self.game.handle_disconnect(self.side)
 
-        if self.db_game.status == "in_progress":
+        if self.game.status == "in_progress" and not self.game.finished:
             await self.game.handle_interruption()
 
-        if game_id in active_games and self.db_game.status in ["completed", "interrupted"]:
-            del active_games[game_id]
+        if self.game.finished or self.game.status in ["completed", "interrupted"]:
+            game_scheduler.remove(self.scope["url_route"]["kwargs"].get("game_id"))
 
-    async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        message_type = text_data_json.get("type", "")
+    async def receive(self, text_data=None, bytes_data=None):
+        message = unpack_input(bytes_data) if bytes_data is not None else json.loads(text_data)
+        message_type = message.get("type", "")
 
         if message_type == "player_ready":
             self.game.players_ready[self.side] = True
@@ -183,14 +178,26 @@ class GameConsumer(AsyncWebsocketConsumer):
             )
             if all(self.game.players_ready):
                 await self.game.startGame(self)
-        elif message_type in ["keydown", "keyup"] and text_data_json.get("key") in ["w", "s"]:
-            if self.db_game.status == "in_progress":
-                await self.game.handle_keys(self.side, message_type, text_data_json["key"])
+        elif message_type == "ack" and isinstance(message.get("seq"), int):
+            self.frames.ack(message["seq"])
+        elif message_type == "resync":
+            self.frames.request_keyframe()
+        elif message_type in ["keydown", "keyup"] and message.get("key") in ["w", "s"]:
+            if self.game.status == "in_progress":
+                await self.game.handle_keys(self.side, message_type, message["key"])
 
     async def state_update(self, event):
         if self.is_connected:
+            objects = event.get("objects")
             try:
-                await self.send(text_data=json.dumps(event.get("objects")))
+                if objects.get("type") == "gameState":
+                    frame = self.frames.encode(objects)
+                    if self.binary:
+                        await self.send(bytes_data=pack_game_state(frame))
+                    else:
+                        await self.send(text_data=json.dumps(frame))
+                else:
+                    await self.send(text_data=json.dumps(objects))
             except Exception:
                 pass
 
@@ -201,39 +208,98 @@ class GameConsumer(AsyncWebsocketConsumer):
             except Exception:
                 pass
 
+
 """
 
-Game Invitation Consumer
+Quick Match Consumer
 
 """
+# Seconds a player removed from the queue by its opponent waits for match_found
+MATCH_FOUND_TIMEOUT = 5
+
+def quick_match_group(user_id: int) -> str:
+    return f"quick_match_{user_id}"
+
+
+class QuickMatchConsumer(AsyncWebsocketConsumer):
+    search_task = None
+
+    @database_sync_to_async
+    def get_rating(self, user_id):
+        return GameStats.objects.filter(user_id=user_id).values_list('rating', flat=True).first() or INITIAL_RATING
+
+    @database_sync_to_async
+    def create_game(self, player1_id, player2_id):
+        return PongGame.objects.create(player1_id=player1_id, player2_id=player2_id)
 
-class GameInvitationConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = f"game_invitation_{self.room_name}"
+        if "error" in self.scope:
+            await self.close()
+            return
+        self.user = self.scope["user"]
+        if not self.user.is_authenticated:
+            await self.close()
+            return
 
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name
-        )
+        self.rating = await self.get_rating(self.user.id)
+        self.group_name = quick_match_group(self.user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        await quick_match_queue.join(self.user.id, self.rating)
+        self.search_task = asyncio.create_task(self.search())
+
+    async def search(self):
+        started = time.monotonic()
+        dequeued_at = None
+        opponent_id = None
+        try:
+            while True:
+                tolerance = quick_match_queue.tolerance(time.monotonic() - started)
+                opponent_id = await quick_match_queue.match(self.user.id, self.rating, tolerance)
+                if opponent_id == NOT_QUEUED:
+                    # Paired by the opponent, whose match_found cancels this task; if it never
+                    # arrives, the opponent failed to create the game or the entry went stale
+                    opponent_id = None
+                    dequeued_at = dequeued_at or time.monotonic()
+                    if time.monotonic() - dequeued_at > MATCH_FOUND_TIMEOUT:
+                        logger.warning("Quick match of user %s: dequeued without a match", self.user.id)
+                        break
+                elif opponent_id:
+                    game = await self.create_game(self.user.id, opponent_id)
+                    event = {"type": "match_found", "game_url": f"/game/{game.id}"}
+                    await self.channel_layer.group_send(quick_match_group(opponent_id), event)
+                    await self.match_found(event)
+                    return
+                await asyncio.sleep(SEARCH_INTERVAL)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Quick match of user %s failed", self.user.id)
+            try:
+                await quick_match_queue.leave(self.user.id)
+                if opponent_id:
+                    await self.channel_layer.group_send(quick_match_group(opponent_id), {"type": "match_failed"})
+            except Exception:
+                logger.exception("Could not clean up the failed quick match of user %s", self.user.id)
+        await self.match_failed({"type": "match_failed"})
+
+    async def match_found(self, event):
+        if self.search_task and self.search_task is not asyncio.current_task():
+            self.search_task.cancel()
+        self.search_task = None
+        await self.send(text_data=json.dumps({"type": "match_found", "game_url": event["game_url"]}))
+
+    async def match_failed(self, event):
+        if self.search_task and self.search_task is not asyncio.current_task():
+            self.search_task.cancel()
+        self.search_task = None
+        await self.send(text_data=json.dumps({"type": "error", "message": "Matchmaking failed, please try again."}))
+        await self.close()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.room_group_name,
-            self.channel_name
-        )
-
-    async def game_accepted(self, event):
-        game_url = event['game_url']
-        await self.send(text_data=json.dumps({
-            'type': 'game_accepted',
-            'game_url': game_url
-        }))
-
-    async def game_invited(self, event):
-        invitation = event['invitation']
-        await self.send(text_data=json.dumps({
-            'type': 'game_invited',
-            'invitation': invitation
-        }))
\ No newline at end of file
+        if not getattr(self, "group_name", None):
+            return
+        if self.search_task:
+            self.search_task.cancel()
+            await quick_match_queue.leave(self.user.id)
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
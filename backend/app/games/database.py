@@ -1,49 +1,88 @@
+import asyncio
+import logging
 from channels.db import database_sync_to_async
+from django.db import transaction, OperationalError, InterfaceError
+from django.db.models import F
+from app.users.models import GameStats
+from app.users.leaderboard import leaderboard
+from app.users.services import RatingService
+from app.tournaments.matchmaker import MatchMaker
+from app.tournaments.snapshot import invalidate_tournament_snapshot
+from .models import PongGame
+
+logger = logging.getLogger(__name__)
+
+FINALIZE_RETRIES = 5
+FINALIZE_BACKOFF = 0.5
+
+pending_writes = set()
 
 class GameDatabase:
     def __init__(self, game_instance):
         self.game = game_instance
-        self.socket = game_instance.socket
 
-    @database_sync_to_async
-    def set_game_status(self, status: str):
-        self.socket.db_game.status = status
-        self.socket.db_game.save()
+    @property
+    def snapshot(self):
+        return self.game.snapshot
 
-    @database_sync_to_async
-    def update_stats(self, winner: int):
-        player1 = self.socket.db_game.player1
-        player2 = self.socket.db_game.player2
-        
-        player1_stats = player1.game_stats
-        player2_stats = player2.game_stats
-        
-        player1_stats.total_matches += 1
-        player2_stats.total_matches += 1
-        
-        if winner == 0:
-            player1_stats.wins += 1
-            player2_stats.losses += 1
-        else:
-            player2_stats.wins += 1
-            player1_stats.losses += 1
-            
-        player1_stats.save()
-        player2_stats.save()
+    async def set_game_status(self, status: str):
+        if self.game.status == status:
+            return
+        self.game.status = status
+        await self._save_status(status)
 
     @database_sync_to_async
-    def set_winner(self, winner: int):
-        game = self.socket.db_game
-        game.winner = game.player1 if winner == 0 else game.player2
-        game.save()
+    def _save_status(self, status: str):
+        PongGame.objects.filter(id=self.snapshot.id).update(status=status)
+        if self.snapshot.tournament_id:
+            invalidate_tournament_snapshot(self.snapshot.tournament_id)
 
-    @database_sync_to_async
-    def set_score(self):
-        game = self.socket.db_game
-        game.score_player1 = self.game.score[0]
-        game.score_player2 = self.game.score[1]
-        game.save()
+    def schedule_finalize(self, winner: int, status: str) -> asyncio.Task:
+        """
+        Queues the match result write off the game loop and returns the task, so callers
+        can broadcast the result right away and await the write only when they depend on it.
+        """
+        self.game.status = status
+        task = asyncio.create_task(self._finalize_with_retry(winner, status, list(self.game.score)))
+        pending_writes.add(task)
+        task.add_done_callback(pending_writes.discard)
+        return task
+
+    async def _finalize_with_retry(self, winner: int, status: str, score: list):
+        for attempt in range(1, FINALIZE_RETRIES + 1):
+            try:
+                await self.finalize_match(winner, status, score)
+                return True
+            except (OperationalError, InterfaceError) as e:
+                if attempt == FINALIZE_RETRIES:
+                    logger.error(f"Giving up on saving the result of game {self.snapshot.id}: {e}")
+                    return False
+                delay = FINALIZE_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(f"Saving the result of game {self.snapshot.id} failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
 
     @database_sync_to_async
-    def get_tournament_id(self):
-        return self.socket.db_game.tournament.id if self.socket.db_game.tournament else None
+    def finalize_match(self, winner: int, status: str, score: list):
+        with transaction.atomic():
+            PongGame.objects.filter(id=self.snapshot.id).update(
+                score_player1=score[0],
+                score_player2=score[1],
+                winner_id=self.snapshot.player_id(winner),
+                status=status,
+            )
+            self._update_stats(winner)
+            if self.snapshot.tournament_id:
+                MatchMaker.advance(self.snapshot.id, self.snapshot.player_id(winner))
+
+    def _update_stats(self, winner: int):
+        winner_id, loser_id = self.snapshot.player_id(winner), self.snapshot.player_id(1 - winner)
+        ratings = RatingService.rate(self.snapshot.id, self.snapshot.player1_id, self.snapshot.player2_id, winner_id)
+        if ratings is None:
+            return
+        GameStats.objects.filter(user_id=winner_id).update(
+            total_matches=F('total_matches') + 1, wins=F('wins') + 1, rating=ratings[winner_id]
+        )
+        GameStats.objects.filter(user_id=loser_id).update(
+            total_matches=F('total_matches') + 1, losses=F('losses') + 1, rating=ratings[loser_id]
+        )
+        transaction.on_commit(lambda: leaderboard.record_match(winner_id, loser_id))
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+KEYFRAME_INTERVAL = 20
+HISTORY_SIZE = 64
+
+class FrameEncoder:
+    """
+    Per-connection encoder for gameState frames.
+    Every KEYFRAME_INTERVAL-th frame (and any frame without a usable baseline) is sent in full.
+    Other frames only carry the fields that changed since the last frame acknowledged by the client,
+    and name that frame in `base` so the client can rebuild the full state.
+    """
+    def __init__(self):
+        self.history = OrderedDict()
+        self.acked = None
+
+    def ack(self, seq):
+        if seq in self.history and (self.acked is None or seq > self.acked):
+            self.acked = seq
+            while next(iter(self.history)) < seq:
+                self.history.popitem(last=False)
+
+    def request_keyframe(self):
+        self.acked = None
+
+    def encode(self, frame):
+        seq = frame["seq"]
+        self.history[seq] = frame
+        while len(self.history) > HISTORY_SIZE:
+            self.history.popitem(last=False)
+
+        base = self.history.get(self.acked) if self.acked is not None else None
+        if base is None or seq % KEYFRAME_INTERVAL == 0:
+            return {**frame, "key": True}
+        return self._delta(base, frame)
+
+    def _delta(self, base, frame):
+        delta = {"type": frame["type"], "seq": frame["seq"], "base": base["seq"]}
+
+        ball = {field: value for field, value in frame["ball"].items() if base["ball"].get(field) != value}
+        if ball:
+            delta["ball"] = ball
+
+        paddles = [None if paddle == base_paddle else paddle for paddle, base_paddle in zip(frame["paddles"], base["paddles"])]
+        if any(paddles):
+            delta["paddles"] = paddles
+        return delta
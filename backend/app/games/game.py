@@ -1,9 +1,13 @@
-import asyncio
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from .physics import Ball, Paddle
+from .scheduler import game_scheduler
 from .database import GameDatabase
 from .communication import GameCommunication
 
+RESET_DELAY = 0.5
+POINTS_TO_WIN = 3
+
 class Game:
     def __init__(self):
         self.ball = Ball(0.5 - 0.01, 0.5 - 0.01)
@@ -15,18 +19,28 @@ class Game:
         self.comm = None
         self.players_ready = [False, False]
         self.players_connected = [False, False]
-        self.reset_timer = False
+        self.consumers = {}
+        self.finished = False
+        self.snapshot = None
+        self.status = None
+        self.resume_at = 0
+        self.physics = None
 
     def reset(self):
         self.ball = Ball(0.5 - 0.01, 0.5 - 0.01)
         self.paddles[0].y = 0.5 - 0.075
         self.paddles[1].y = 0.5 - 0.075
-        self.reset_timer = True
+        self.resume_at = time.monotonic() + RESET_DELAY
+
+    def attach_snapshot(self, snapshot):
+        self.snapshot = snapshot
+        if self.status is None:
+            self.status = snapshot.status
 
-    async def handle_disconnect(self):
-        if hasattr(self.socket, 'side'):
-            side = self.socket.side
-            self.players_connected[side] = False
+    async def handle_disconnect(self, side: int):
+        self.players_connected[side] = False
+        # Leaving before anyone is ready does not end the game: the player may come back to it
+        if self.socket is not None:
             self.disconnected = True
 
     async def handle_ready(self, socket: AsyncWebsocketConsumer):
@@ -36,13 +50,11 @@ class Game:
         await self.db.set_game_status("in_progress")
 
     async def handle_interruption(self):
-        await self.db.set_score()
+        self.finished = True
         winner = 0 if self.score[0] > self.score[1] else 1
-        await self.db.update_stats(winner)
-        await self.db.set_winner(winner)
-        await self.db.set_game_status("interrupted")
-        await self.comm.send_game_over()
+        result_saved = self.db.schedule_finalize(winner, "interrupted")
         self.players_ready = [False, False]
+        await self.comm.send_game_over(result_saved)
 
     async def handle_keys(self, side, message_type, key):
         async with self.socket.update_lock:
@@ -50,58 +62,59 @@ class Game:
                 self.paddles[side].moving = -0.04 if key == "w" else 0.04
             elif message_type == "keyup":
                 self.paddles[side].moving = 0
-
-    async def game_loop(self):
-        if not self.socket:
-            return
-
-        counter = 0
-        while not self.disconnected:
-            counter += 1
-
-            if self.score[0] >= 3 or self.score[1] >= 3:
-                winner = 0 if self.score[0] >= 3 else 1
-                await self.db.set_score()
-                await self.db.update_stats(winner)
-                await self.db.set_winner(winner)
-                await self.db.set_game_status("completed")
-                await self.comm.send_game_over()
+            if self.physics:
+                self.physics.set_moving(self, side, self.paddles[side].moving)
+
+    def winner_side(self):
+        if self.score[0] >= POINTS_TO_WIN:
+            return 0
+        if self.score[1] >= POINTS_TO_WIN:
+            return 1
+        return None
+
+    def step(self, steps: int, dt: float):
+        for _ in range(steps):
+            if time.monotonic() < self.resume_at:
+                return
+            self._update_game_state(dt)
+            self._handle_collisions()
+            if self._check_scoring():
                 return
-            
-            if self.reset_timer:
-                await asyncio.sleep(0.5)
-                self.reset_timer = False
-
-            self._update_game_state()
-            await self._handle_collisions()
-            await self._check_scoring()
-            await self.comm.send_game_state()
-            await asyncio.sleep(0.1)
 
-        await self.comm.send_game_over()
+    async def finish(self):
+        winner = self.winner_side()
+        result_saved = None
+        if winner is not None and not self.disconnected:
+            self.finished = True
+            result_saved = self.db.schedule_finalize(winner, "completed")
+        await self.comm.send_game_over(result_saved)
 
-    def _update_game_state(self):
-        self.ball.update()
+    def _update_game_state(self, dt: float = 1.0):
+        self.ball.update(dt)
         for paddle in self.paddles:
-            paddle.update()
+            paddle.update(dt)
 
-    async def _handle_collisions(self):
+    def _handle_collisions(self):
         for paddle in self.paddles:
-            if self.ball.collides(paddle):
+            if self.ball.collides(paddle) and self.ball.moving_towards(paddle):
                 self.ball.calculate_angle(paddle)
 
-    async def _check_scoring(self):
+    def _check_scoring(self) -> bool:
         if self.ball.x < self.paddles[0].x:
-            self.reset()
-            self.score[1] += 1
-            await self.comm.send_score_update()
+            self.score_point(1)
+            return True
 
         if self.ball.x + self.ball.width > self.paddles[1].x + self.paddles[1].width:
-            self.reset()
-            self.score[0] += 1
-            await self.comm.send_score_update()
+            self.score_point(0)
+            return True
+        return False
+
+    def score_point(self, side: int):
+        self.reset()
+        self.score[side] += 1
+        self.comm.queue_score_update()
 
     async def startGame(self, socket: AsyncWebsocketConsumer):
         await self.db.set_game_status("in_progress")
         await self.comm.send_game_state()
-        asyncio.create_task(self.game_loop())
\ No newline at end of file
+        game_scheduler.start(self)
@@ -0,0 +1,157 @@
+import json
+import random
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from app.games.models import PongGame, GameInvitation
+from app.users.models import Friendship
+
+User = get_user_model()
+
+BENCHMARKED_MODELS = (PongGame, Friendship, GameInvitation)
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = (
+        'Seed large game, friendship and invitation tables and print EXPLAIN ANALYZE timings of the hot queries '
+        'with and without their indexes. Runs in a single transaction that is rolled back: the seeded rows are '
+        'discarded and the dropped indexes restored. Dropping the indexes locks the tables until the end, '
+        'so do not run it against a database serving traffic.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--games', type=int, default=200000)
+        parser.add_argument('--friendships', type=int, default=20000)
+        parser.add_argument('--invitations', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per query, the fastest one is reported')
+
+    def handle(self, *args, **kwargs):
+        self.repeat = kwargs['repeat']
+        try:
+            with transaction.atomic():
+                users = self.seed(kwargs['users'], kwargs['games'], kwargs['friendships'], kwargs['invitations'])
+                queries = self.queries(users)
+
+                after = self.run(queries)
+                self.drop_indexes()
+                before = self.run(queries)
+
+                self.report(before, after)
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS('Rolled back the seeded rows and restored the indexes'))
+
+    def seed(self, user_count, game_count, friendship_count, invitation_count):
+        self.stdout.write(self.style.NOTICE(
+            f'Seeding {user_count} users, {game_count} games, {friendship_count} friendships and {invitation_count} invitations...'
+        ))
+        prefix = f'bench{random.randrange(10 ** 6)}_'
+        users = User.objects.bulk_create(
+            [User(username=f'{prefix}{i}'[:20], email=f'{prefix}{i}@benchmark.local', email_is_verified=True) for i in range(user_count)],
+            batch_size=5000,
+        )
+        user_ids = [user.id for user in users]
+        now = timezone.now()
+
+        games = []
+        for i in range(game_count):
+            player1, player2 = random.sample(user_ids, 2)
+            status = random.choices(['completed', 'interrupted', 'in_progress', 'not_started'], weights=[80, 10, 5, 5])[0]
+            games.append(PongGame(
+                player1_id=player1,
+                player2_id=player2,
+                winner_id=random.choice([player1, player2]) if status in ('completed', 'interrupted') else None,
+                status=status,
+                score_player1=random.randint(0, 3),
+                score_player2=random.randint(0, 3),
+                registered_on_blockchain=random.random() < 0.99,
+            ))
+        PongGame.objects.bulk_create(games, batch_size=5000)
+
+        pairs = set()
+        while len(pairs) < friendship_count:
+            pairs.add(tuple(random.sample(user_ids, 2)))
+        Friendship.objects.bulk_create(
+            [Friendship(sender_id=sender, receiver_id=receiver, status=random.choice(['accepted', 'accepted', 'pending'])) for sender, receiver in pairs],
+            batch_size=5000,
+        )
+
+        invitations = []
+        for i in range(invitation_count):
+            sender, receiver = random.sample(user_ids, 2)
+            invitations.append(GameInvitation(
+                sender_id=sender,
+                receiver_id=receiver,
+                status=random.choices(['pending', 'accepted', 'expired'], weights=[5, 45, 50])[0],
+                expires_at=now + timedelta(minutes=random.randint(-10000, 10)),
+            ))
+        GameInvitation.objects.bulk_create(invitations, batch_size=5000)
+
+        self.analyze()
+        return user_ids
+
+    def queries(self, user_ids):
+        user, other = random.sample(user_ids, 2)
+        now = timezone.now()
+        finished = ['completed', 'interrupted']
+        return {
+            'match history': PongGame.objects.filter(
+                Q(player1_id=user) | Q(player2_id=user), status__in=finished
+            ).order_by('-date_played', '-id')[:20],
+            'blockchain poller': PongGame.objects.filter(
+                status__in=finished, registered_on_blockchain=False, id__gt=0
+            ).order_by('id'),
+            'accepted friendship': Friendship.objects.filter(
+                Q(sender_id=user, receiver_id=other) | Q(sender_id=other, receiver_id=user), status='accepted'
+            ).values('id')[:1],
+            'pending invitation': GameInvitation.objects.filter(
+                sender_id=user, receiver_id=other, status='pending', expires_at__gt=now
+            )[:1],
+            'expired invitations': GameInvitation.objects.filter(status='pending', expires_at__lt=now),
+        }
+
+    def run(self, queries):
+        results = {}
+        for name, queryset in queries.items():
+            runs = [json.loads(queryset.explain(analyze=True, format='json'))[0] for _ in range(self.repeat)]
+            best = min(runs, key=lambda run: run['Execution Time'])
+            results[name] = (best['Execution Time'], self.scans(best['Plan']))
+        return results
+
+    def scans(self, plan):
+        """Returns the scan nodes of a plan, e.g. 'Index Scan using game_p1_history_idx'."""
+        scans = []
+        if 'Scan' in plan['Node Type']:
+            index = plan.get('Index Name')
+            scans.append(f"{plan['Node Type']} using {index}" if index else f"{plan['Node Type']} on {plan.get('Relation Name')}")
+        for child in plan.get('Plans', []):
+            scans += self.scans(child)
+        return scans
+
+    def drop_indexes(self):
+        with connection.schema_editor() as schema_editor:
+            for model in BENCHMARKED_MODELS:
+                for index in model._meta.indexes:
+                    schema_editor.remove_index(model, index)
+        self.analyze()
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            for model in BENCHMARKED_MODELS:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    def report(self, before, after):
+        for name in after:
+            before_ms, before_scans = before[name]
+            after_ms, after_scans = after[name]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f'  before: {before_ms:10.3f} ms  {", ".join(before_scans)}')
+            self.stdout.write(f'  after:  {after_ms:10.3f} ms  {", ".join(after_scans)}')
+            if after_ms:
+                self.stdout.write(f'  speedup: {before_ms / after_ms:.1f}x')
@@ -0,0 +1,92 @@
+import time
+from app.redis_client import get_async_redis
+
+QUEUE_KEY = "matchmaking:queue"
+SEEN_KEY = "matchmaking:seen"
+
+# Rating tolerance grows with waiting time, so that any two waiting players are eventually paired
+BASE_TOLERANCE = 50
+TOLERANCE_PER_SECOND = 25
+MAX_TOLERANCE = 400
+SEARCH_INTERVAL = 1
+# Entries not refreshed for this long belong to lost connections and are dropped
+STALE_AFTER = 10
+# Returned by match() for a player no longer in the queue: matched by an opponent, or dropped
+NOT_QUEUED = -1
+
+# Refreshes ARGV[1] and pairs it with the waiting player of closest rating within the tolerance,
+# removing both from the queue. Only the few nearest entries on each side are read, so a match
+# is O(log n). Returns -1 if ARGV[1] is not queued, without refreshing it.
+MATCH = """
+local user = ARGV[1]
+local rating = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local stale_before = tonumber(ARGV[5])
+if not redis.call('ZSCORE', KEYS[1], user) then
+    return -1
+end
+redis.call('HSET', KEYS[2], user, now)
+
+local best, best_distance = false, nil
+local function nearest(candidates)
+    for i = 1, #candidates, 2 do
+        local member = candidates[i]
+        if member ~= user then
+            local seen = tonumber(redis.call('HGET', KEYS[2], member) or 0)
+            if seen < stale_before then
+                redis.call('ZREM', KEYS[1], member)
+                redis.call('HDEL', KEYS[2], member)
+            else
+                local distance = math.abs(tonumber(candidates[i + 1]) - rating)
+                if not best_distance or distance < best_distance then
+                    best, best_distance = member, distance
+                end
+                return
+            end
+        end
+    end
+end
+
+nearest(redis.call('ZREVRANGEBYSCORE', KEYS[1], rating, rating - tolerance, 'WITHSCORES', 'LIMIT', 0, 8))
+nearest(redis.call('ZRANGEBYSCORE', KEYS[1], '(' .. rating, rating + tolerance, 'WITHSCORES', 'LIMIT', 0, 8))
+if best then
+    redis.call('ZREM', KEYS[1], user, best)
+    redis.call('HDEL', KEYS[2], user, best)
+end
+return best
+"""
+
+class QuickMatchQueue:
+    """
+    Players waiting for a quick match, in a Redis sorted set scored by rating and shared by
+    every ASGI process. Each waiting player's consumer calls match() once per SEARCH_INTERVAL
+    with a tolerance widening with its waiting time; the call also keeps its entry fresh.
+    """
+    def __init__(self):
+        self._match = None
+
+    def tolerance(self, waited):
+        return min(BASE_TOLERANCE + TOLERANCE_PER_SECOND * waited, MAX_TOLERANCE)
+
+    async def join(self, user_id, rating):
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            pipe.zadd(QUEUE_KEY, {user_id: rating})
+            pipe.hset(SEEN_KEY, user_id, time.time())
+            await pipe.execute()
+
+    async def leave(self, user_id):
+        async with get_async_redis().pipeline(transaction=True) as pipe:
+            pipe.zrem(QUEUE_KEY, user_id)
+            pipe.hdel(SEEN_KEY, user_id)
+            await pipe.execute()
+
+    async def match(self, user_id, rating, tolerance):
+        """Returns the id of the opponent, None if nobody is within tolerance yet, or NOT_QUEUED."""
+        if self._match is None:
+            self._match = get_async_redis().register_script(MATCH)
+        now = time.time()
+        opponent = await self._match(keys=[QUEUE_KEY, SEEN_KEY], args=[user_id, rating, tolerance, now, now - STALE_AFTER])
+        return int(opponent) if opponent else None
+
+quick_match_queue = QuickMatchQueue()
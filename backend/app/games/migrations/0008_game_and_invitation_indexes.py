@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_remove_ponggame_match_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ponggame',
+            index=models.Index(condition=models.Q(('status__in', ['completed', 'interrupted'])), fields=['player1', '-date_played', '-id'], name='game_p1_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ponggame',
+            index=models.Index(condition=models.Q(('status__in', ['completed', 'interrupted'])), fields=['player2', '-date_played', '-id'], name='game_p2_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ponggame',
+            index=models.Index(condition=models.Q(('registered_on_blockchain', False), ('status__in', ['completed', 'interrupted'])), fields=['id'], name='game_unregistered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameinvitation',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['sender', 'receiver', 'expires_at'], name='invitation_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameinvitation',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at'], name='invitation_pending_exp_idx'),
+        ),
+    ]
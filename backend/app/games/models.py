@@ -29,6 +29,27 @@ class PongGame(models.Model):
     )
     tournament = models.ForeignKey(Tournament, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Match history of a player, newest first
+            models.Index(
+                fields=['player1', '-date_played', '-id'],
+                condition=models.Q(status__in=['completed', 'interrupted']),
+                name='game_p1_history_idx',
+            ),
+            models.Index(
+                fields=['player2', '-date_played', '-id'],
+                condition=models.Q(status__in=['completed', 'interrupted']),
+                name='game_p2_history_idx',
+            ),
+            # Finished games still to be pushed by the blockchain poller
+            models.Index(
+                fields=['id'],
+                condition=models.Q(registered_on_blockchain=False, status__in=['completed', 'interrupted']),
+                name='game_unregistered_idx',
+            ),
+        ]
+
     def __str__(self):
         player1_username = self.player1.username if self.player1 else "N/A"
         player2_username = self.player2.username if self.player2 else "N/A"
@@ -51,5 +72,21 @@ class GameInvitation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(default=default_expires_at)
 
+    class Meta:
+        indexes = [
+            # Pending invitation between two users
+            models.Index(
+                fields=['sender', 'receiver', 'expires_at'],
+                condition=models.Q(status='pending'),
+                name='invitation_pending_idx',
+            ),
+            # Pending invitations to expire
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(status='pending'),
+                name='invitation_pending_exp_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"Game invitation from {self.sender.username} to {self.receiver.username}"
\ No newline at end of file
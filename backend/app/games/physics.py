@@ -1,6 +1,11 @@
 import math
 import random
 
+# Speeds are expressed in units per reference tick (the original 10 Hz loop),
+# so gameplay speed stays the same whatever the simulation tick rate is.
+REFERENCE_TICK_RATE = 10
+PRECISION = 4
+
 def truncate(n, decimals=0) -> float:
     multiplier = 10 ** decimals
     return int(n * multiplier) / multiplier
@@ -29,8 +34,8 @@ class Paddle(Hitbox):
         super().__init__(x, 0.5 - 0.075, 0.02, 0.25)
         self.moving: float = 0
 
-    def update(self):
-        self.y = truncate(self.y + self.moving, 2)
+    def update(self, dt: float = 1.0):
+        self.y = truncate(self.y + self.moving * dt, PRECISION)
         if self.y < 0:
             self.y = 0
         elif self.y + self.height > 1:
@@ -55,9 +60,14 @@ class Ball(Hitbox):
         self.speed_x = speed * math.cos(angle) * (-1 if self.speed_x > 0 else 1)
         self.speed_y = speed * math.sin(angle)
 
-    def update(self):
-        self.x = truncate(self.x + self.speed_x, 2)
-        self.y = truncate(self.y + self.speed_y, 2)
+    def moving_towards(self, paddle: Paddle) -> bool:
+        if paddle.x + paddle.width / 2 < self.x + self.width / 2:
+            return self.speed_x < 0
+        return self.speed_x > 0
+
+    def update(self, dt: float = 1.0):
+        self.x = truncate(self.x + self.speed_x * dt, PRECISION)
+        self.y = truncate(self.y + self.speed_y * dt, PRECISION)
         
         if self.y <= 0:
             self.y = 0
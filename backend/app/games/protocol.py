@@ -0,0 +1,64 @@
+"""
+Binary game protocol
+Negotiated with the `pong.binary.v1` WebSocket subprotocol or the `encoding=binary` query parameter.
+Only the hot path is binary: gameState frames sent by the server and key/ack/resync messages sent
+by the client. Every other message stays JSON.
+
+gameState frame (little-endian):
+    u8 type (1) | u8 flags (bit 0: keyframe) | u8 field mask | u32 seq | u32 base | f32 per field in mask
+    Field mask bits, in order: ball.x, ball.y, ball.speed_x, ball.speed_y, paddles[0].y, paddles[1].y
+
+Client messages:
+    u8 op (1: keydown, 2: keyup) | u8 key ('w' or 's')
+    u8 op (3: ack) | u32 seq
+    u8 op (4: resync)
+"""
+import struct
+from typing import Optional, Tuple
+from urllib.parse import parse_qs
+
+BINARY_SUBPROTOCOL = "pong.binary.v1"
+
+GAME_STATE = 1
+KEYFRAME = 0x01
+HEADER = struct.Struct("<BBBII")
+SEQ = struct.Struct("<I")
+BALL_FIELDS = ("x", "y", "speed_x", "speed_y")
+
+INPUT_OPS = {1: "keydown", 2: "keyup", 3: "ack", 4: "resync"}
+
+def wants_binary(scope) -> Tuple[bool, Optional[str]]:
+    """Returns whether the client asked for binary frames, and the subprotocol to accept if any."""
+    if BINARY_SUBPROTOCOL in scope.get("subprotocols", []):
+        return True, BINARY_SUBPROTOCOL
+    query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+    return query.get("encoding", [""])[0] == "binary", None
+
+def pack_game_state(frame) -> bytes:
+    values = []
+    mask = 0
+    ball = frame.get("ball") or {}
+    for bit, field in enumerate(BALL_FIELDS):
+        if field in ball:
+            mask |= 1 << bit
+            values.append(ball[field])
+    for side, paddle in enumerate(frame.get("paddles") or []):
+        if paddle is not None:
+            mask |= 1 << (len(BALL_FIELDS) + side)
+            values.append(paddle["y"])
+
+    flags = KEYFRAME if frame.get("key") else 0
+    header = HEADER.pack(GAME_STATE, flags, mask, frame["seq"], frame.get("base", 0))
+    return header + struct.pack(f"<{len(values)}f", *values)
+
+def unpack_input(data: bytes) -> dict:
+    if not data:
+        return {}
+    message_type = INPUT_OPS.get(data[0], "")
+    if message_type in ("keydown", "keyup") and len(data) == 2:
+        return {"type": message_type, "key": chr(data[1])}
+    if message_type == "ack" and len(data) == 1 + SEQ.size:
+        return {"type": message_type, "seq": SEQ.unpack_from(data, 1)[0]}
+    if message_type == "resync":
+        return {"type": message_type}
+    return {}
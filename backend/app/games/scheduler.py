@@ -0,0 +1,126 @@
+import time
+import asyncio
+import logging
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from .clock import FixedTimestep
+from .physics import REFERENCE_TICK_RATE
+from .batch_physics import BatchPhysics
+
+logger = logging.getLogger(__name__)
+
+class GameScheduler:
+    """
+    Per-process owner of every active game.
+    Running games are stepped together on one shared fixed-timestep clock, and the outbound
+    messages of all games are flushed in one batch per tick.
+    With GAME_PHYSICS_BACKEND = 'numpy', running games are simulated by a single BatchPhysics engine.
+    """
+    def __init__(self):
+        self.games = {}
+        self.running = set()
+        self.clock = None
+        self.task = None
+        self.physics = None
+        # The event loop only keeps weak references to tasks
+        self.finishing = set()
+
+    def _get_physics(self):
+        if self.physics is None and settings.GAME_PHYSICS_BACKEND == 'numpy':
+            if not BatchPhysics.available():
+                raise ImproperlyConfigured("GAME_PHYSICS_BACKEND is 'numpy' but NumPy is not installed")
+            self.physics = BatchPhysics()
+        return self.physics
+
+    def get_or_create(self, game_id, factory):
+        if game_id not in self.games:
+            self.games[game_id] = factory()
+        return self.games[game_id]
+
+    def remove(self, game_id):
+        game = self.games.pop(game_id, None)
+        if game:
+            self._stop(game)
+
+    def start(self, game):
+        self.running.add(game)
+        physics = self._get_physics()
+        if physics:
+            physics.add(game)
+            game.physics = physics
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def _stop(self, game):
+        self.running.discard(game)
+        if game.physics:
+            game.physics.remove(game)
+            game.physics = None
+
+    def stats(self):
+        return {
+            "active_games": len(self.games),
+            "running_games": len(self.running),
+            "jitter": self.clock.jitter.as_dict() if self.clock else None,
+        }
+
+    async def run(self):
+        self.clock = FixedTimestep(settings.GAME_TICK_RATE, settings.GAME_BROADCAST_RATE)
+        dt = REFERENCE_TICK_RATE / settings.GAME_TICK_RATE
+
+        while self.running:
+            steps = self.clock.due_steps()
+            broadcast = self.clock.broadcast_due()
+            ended = []
+
+            if self.physics:
+                self._step_batch(steps, dt)
+
+            for game in list(self.running):
+                try:
+                    if game.disconnected or game.winner_side() is not None:
+                        self._stop(game)
+                        ended.append(game)
+                        continue
+                    if not game.physics:
+                        game.step(steps, dt)
+                    if broadcast:
+                        if game.physics:
+                            game.physics.store(game)
+                        game.comm.queue_game_state()
+                except Exception:
+                    logger.exception("Game step failed, removing game from the scheduler")
+                    self._stop(game)
+
+            await self.flush()
+            for game in ended:
+                self._finish(game)
+
+            await asyncio.sleep(self.clock.time_until_next())
+
+        logger.info(f"Game scheduler idle: {self.stats()}")
+
+    def _finish(self, game):
+        task = asyncio.create_task(game.finish())
+        self.finishing.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task):
+        self.finishing.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Finishing game failed", exc_info=task.exception())
+
+    def _step_batch(self, steps, dt):
+        for game, side in self.physics.step(steps, dt, time.monotonic()):
+            game.score_point(side)
+            self.physics.load(game)
+
+    async def flush(self):
+        pending = [game.comm.flush() for game in self.games.values() if game.comm and game.comm.outbox]
+        if not pending:
+            return
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to flush game state: {result}")
+
+game_scheduler = GameScheduler()
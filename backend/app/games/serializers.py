@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 class GameStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = GameStats
-        fields = ['total_matches', 'wins', 'losses']
+        fields = ['total_matches', 'wins', 'losses', 'rating']
 
 class PlayerSerializer(serializers.ModelSerializer, AvatarUploadMixin):
     class Meta:
@@ -36,26 +36,19 @@ class PongGameSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class MatchHistorySerializer(serializers.ModelSerializer):
+    """Expects games annotated with opponent_id, opponent_username and result (see MatchHistoryListView)."""
     opponent = serializers.SerializerMethodField()
-    result = serializers.SerializerMethodField()
+    result = serializers.CharField(read_only=True)
 
     class Meta:
         model = PongGame
         fields = ['opponent', 'result', 'date_played']
 
     def get_opponent(self, obj):
-        user_id = self.context['request'].parser_context['kwargs']['id']
-        opponent = obj.player2 if obj.player1.id == user_id else obj.player1
         return {
-            'id': opponent.id,
-            'username': opponent.username
+            'id': obj.opponent_id,
+            'username': obj.opponent_username
         }
-
-    def get_result(self, obj):
-        user_id = self.context['request'].parser_context['kwargs']['id']
-        if obj.winner is None:
-            return 'unfinished'
-        return 'win' if obj.winner.id == user_id else 'loss'
         
 class UserOnlineStatusSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
@@ -86,12 +79,15 @@ class FriendSerializer(serializers.ModelSerializer, AvatarUploadMixin):
         fields = ['id', 'username', 'avatar_oauth', 'avatar_upload', 'date_joined', 'game_stats', 'game_invite']
 
     def get_game_invite(self, friend):
-        user = self.context['request'].user
-
-        invitation = GameInvitation.objects.filter(
-            Q(sender=user, receiver=friend) | Q(sender=friend, receiver=user),
-            status='pending'
-        ).order_by('-created_at').first()
+        game_invites = self.context.get('game_invites')
+        if game_invites is not None:
+            invitation = game_invites.get(friend.id)
+        else:
+            user = self.context['request'].user
+            invitation = GameInvitation.objects.filter(
+                Q(sender=user, receiver=friend) | Q(sender=friend, receiver=user),
+                status='pending'
+            ).order_by('-created_at').first()
 
         return GameInvitationSerializer(invitation).data if invitation else None
     
@@ -114,10 +110,14 @@ class UserListSerializer(serializers.ModelSerializer, AvatarUploadMixin):
         fields = ['id', 'username', 'avatar_oauth', 'avatar_upload', 'date_joined', 'game_stats', 'friendship']
 
     def get_friendship(self, target_user):
-        user = self.context['request'].user
-        friendship = Friendship.objects.filter(
-            Q(sender=user, receiver=target_user) | Q(sender=target_user, receiver=user)
-        ).first()
+        friendships = self.context.get('friendships')
+        if friendships is not None:
+            friendship = friendships.get(target_user.id)
+        else:
+            user = self.context['request'].user
+            friendship = Friendship.objects.filter(
+                Q(sender=user, receiver=target_user) | Q(sender=target_user, receiver=user)
+            ).first()
         return FriendshipSerializer(friendship).data if friendship else None
 
     def to_representation(self, instance):
@@ -0,0 +1,52 @@
+from typing import NamedTuple, Optional
+from .models import PongGame
+
+class GameSnapshot(NamedTuple):
+    """
+    Immutable view of the PongGame row and both players, loaded with a single query
+    and shared by the GameConsumers and the Game of a match.
+    """
+    id: int
+    channel_group_name: str
+    status: str
+    winner_id: Optional[int]
+    tournament_id: Optional[int]
+    player1_id: Optional[int]
+    player1_username: Optional[str]
+    player2_id: Optional[int]
+    player2_username: Optional[str]
+
+    @classmethod
+    def load(cls, game_id) -> Optional["GameSnapshot"]:
+        game = PongGame.objects.select_related('player1', 'player2').only(
+            'id', 'channel_group_name', 'status', 'winner_id', 'tournament_id',
+            'player1__id', 'player1__username', 'player2__id', 'player2__username',
+        ).filter(id=game_id).first()
+        if not game:
+            return None
+        return cls(
+            id=game.id,
+            channel_group_name=game.channel_group_name,
+            status=game.status,
+            winner_id=game.winner_id,
+            tournament_id=game.tournament_id,
+            player1_id=game.player1_id,
+            player1_username=game.player1.username if game.player1 else None,
+            player2_id=game.player2_id,
+            player2_username=game.player2.username if game.player2 else None,
+        )
+
+    def side_of(self, user_id) -> Optional[int]:
+        if user_id is None:
+            return None
+        if user_id == self.player1_id:
+            return 0
+        if user_id == self.player2_id:
+            return 1
+        return None
+
+    def player_id(self, side: int) -> Optional[int]:
+        return self.player1_id if side == 0 else self.player2_id
+
+    def username(self, side: int) -> Optional[str]:
+        return self.player1_username if side == 0 else self.player2_username
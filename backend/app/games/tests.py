@@ -1,3 +1,161 @@
-from django.test import TestCase
+import copy
+import time
+import uuid
+import random
+import asyncio
+from unittest import mock, skipUnless
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from app.games.batch_physics import BatchPhysics
+from app.games.consumers import GameConsumer
+from app.games.database import pending_writes
+from app.games.game import Game
+from app.games import matchmaking
+from app.games.matchmaking import quick_match_queue, NOT_QUEUED, STALE_AFTER
+from app.games.physics import REFERENCE_TICK_RATE
+from app.games.models import PongGame
+from app.games.scheduler import game_scheduler
+from app.redis_client import get_redis
 
-# Create your tests here.
\ No newline at end of file
+User = get_user_model()
+
+IN_MEMORY_CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class GameConsumerTests(TransactionTestCase):
+    def setUp(self):
+        self.players = [
+            User.objects.create_user(username=f"player{i}", email=f"player{i}@example.com", password="password")
+            for i in range(2)
+        ]
+        self.game_id = str(PongGame.objects.create(player1=self.players[0], player2=self.players[1]).id)
+
+    def tearDown(self):
+        game_scheduler.remove(self.game_id)
+
+    async def connect(self, player):
+        communicator = WebsocketCommunicator(GameConsumer.as_asgi(), f"/ws/{self.game_id}/")
+        communicator.scope["user"] = player
+        communicator.scope["url_route"] = {"kwargs": {"game_id": self.game_id}}
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())["type"], "connection_established")
+        return communicator
+
+    async def test_reconnecting_before_ready_keeps_the_game_playable(self):
+        first = await self.connect(self.players[0])
+        await first.disconnect()
+
+        game = game_scheduler.games[self.game_id]
+        self.assertFalse(game.disconnected)
+
+        first = await self.connect(self.players[0])
+        second = await self.connect(self.players[1])
+        await first.send_json_to({"type": "player_ready"})
+        await second.send_json_to({"type": "player_ready"})
+        await asyncio.sleep(0.2)
+
+        self.assertIn(game, game_scheduler.running)
+        self.assertFalse(game.disconnected)
+        self.assertEqual(game.score, [0, 0])
+        self.assertFalse(game.finished)
+        status = await database_sync_to_async(lambda: PongGame.objects.get(id=self.game_id).status)()
+        self.assertEqual(status, "in_progress")
+
+        game_scheduler.remove(self.game_id)
+        await first.disconnect()
+        await second.disconnect()
+        await asyncio.gather(*pending_writes, return_exceptions=True)
+
+@skipUnless(BatchPhysics.available(), "NumPy is not installed")
+class BatchPhysicsTests(SimpleTestCase):
+    GAMES = 100
+    TICKS = 3000
+    DT = REFERENCE_TICK_RATE / 60
+
+    def create_pair(self):
+        scalar = Game()
+        scalar.comm = mock.Mock()
+        batched = Game()
+        batched.comm = mock.Mock()
+        batched.ball = copy.deepcopy(scalar.ball)
+        return scalar, batched
+
+    def assert_same_state(self, scalar, batched, tick):
+        state = lambda game: (
+            game.ball.x, game.ball.y, game.ball.speed_x, game.ball.speed_y,
+            [paddle.y for paddle in game.paddles], game.score,
+        )
+        self.assertEqual(state(batched), state(scalar), f"diverged at tick {tick}")
+
+    def test_batched_games_evolve_exactly_like_scalar_games(self):
+        random.seed(1234)
+        physics = BatchPhysics(capacity=8)
+        pairs = [self.create_pair() for _ in range(self.GAMES)]
+        for _, batched in pairs:
+            physics.add(batched)
+
+        for tick in range(self.TICKS):
+            for scalar, batched in pairs:
+                for side in (0, 1):
+                    if random.random() < 0.05:
+                        moving = random.choice((-0.04, 0, 0.04))
+                        scalar.paddles[side].moving = batched.paddles[side].moving = moving
+                        physics.set_moving(batched, side, moving)
+
+            steps = random.randint(1, 3)
+            for scalar, _ in pairs:
+                scalar.step(steps, self.DT)
+            for batched, side in physics.step(steps, self.DT, now=0):
+                batched.score_point(side)
+
+            for scalar, batched in pairs:
+                if scalar.resume_at:
+                    # Both were reset at random: serve the same ball again, without the pause
+                    batched.ball = copy.deepcopy(scalar.ball)
+                    scalar.resume_at = batched.resume_at = 0
+                    physics.load(batched)
+                physics.store(batched)
+                self.assert_same_state(scalar, batched, tick)
+
+class QuickMatchQueueTests(SimpleTestCase):
+    def setUp(self):
+        prefix = f"test-{uuid.uuid4()}"
+        self.queue_key, self.seen_key = f"{prefix}:queue", f"{prefix}:seen"
+        patcher = mock.patch.multiple(matchmaking, QUEUE_KEY=self.queue_key, SEEN_KEY=self.seen_key)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(get_redis().delete, self.queue_key, self.seen_key)
+
+    def test_tolerance_widens_with_waiting_time_up_to_a_cap(self):
+        self.assertEqual(quick_match_queue.tolerance(0), 50)
+        self.assertEqual(quick_match_queue.tolerance(4), 150)
+        self.assertEqual(quick_match_queue.tolerance(60), 400)
+
+    async def test_players_are_paired_with_the_closest_rating_within_tolerance(self):
+        await quick_match_queue.join(1, 1000)
+        await quick_match_queue.join(2, 1100)
+        await quick_match_queue.join(3, 1120)
+
+        # Nobody within 50 of player 1 yet
+        self.assertIsNone(await quick_match_queue.match(1, 1000, 50))
+        # Player 2 is closer than player 3
+        self.assertEqual(await quick_match_queue.match(1, 1000, 150), 2)
+
+        # The paired opponent is no longer queued, and its next poll leaves no entry behind
+        self.assertEqual(await quick_match_queue.match(2, 1100, 150), NOT_QUEUED)
+        redis = get_redis()
+        self.assertEqual(redis.zrange(self.queue_key, 0, -1), ["3"])
+        self.assertEqual(redis.hkeys(self.seen_key), ["3"])
+
+        # A player that stopped polling is dropped instead of being matched
+        redis.hset(self.seen_key, 3, time.time() - STALE_AFTER - 1)
+        await quick_match_queue.join(4, 1130)
+        self.assertIsNone(await quick_match_queue.match(4, 1130, 50))
+        self.assertEqual(redis.zrange(self.queue_key, 0, -1), ["4"])
+
+        await quick_match_queue.leave(4)
+        self.assertEqual(redis.zcard(self.queue_key), 0)
+        self.assertEqual(redis.hlen(self.seen_key), 0)
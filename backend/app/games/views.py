@@ -11,7 +11,8 @@ from .serializers import GameInvitationSerializer, PongGameSerializer, MatchHist
 from django.db import transaction
 from django.db import models
 from app.users.models import Friendship
-from django.db.models import Q
+from app.pagination import KeysetPagination
+from django.db.models import Q, F, Case, When, Value
 from django.utils import timezone
 
 User = get_user_model()
@@ -119,11 +120,30 @@ class PongGameDetailView(RetrieveAPIView):
         return PongGame.objects.filter(models.Q(player1=user) | models.Q(player2=user))
 
 class MatchHistoryListView(ListAPIView):
+    """
+    Lists the finished games of a user, newest first, one keyset page at a time.
+    The opponent and the result are computed in SQL.
+    """
     serializer_class = MatchHistorySerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-date_played', '-id')
 
     def get_queryset(self):
+        return PongGame.objects.filter(status__in=['completed', 'interrupted']).only('id', 'date_played')
+
+    def get_keyset_branches(self, queryset):
+        """One branch per player column, each a range scan of its match history index."""
         user_id = self.kwargs.get('id')
-        return PongGame.objects.filter(
-            (Q(player1_id=user_id) | Q(player2_id=user_id)) & 
-            (Q(status="completed") | Q(status="interrupted"))
+        result = Case(
+            When(winner__isnull=True, then=Value('unfinished')),
+            When(winner_id=user_id, then=Value('win')),
+            default=Value('loss'),
         )
+        return [
+            queryset.filter(player1_id=user_id).annotate(
+                opponent_id=F('player2_id'), opponent_username=F('player2__username'), result=result
+            ),
+            queryset.filter(player2_id=user_id).annotate(
+                opponent_id=F('player1_id'), opponent_username=F('player1__username'), result=result
+            ),
+        ]
@@ -0,0 +1,99 @@
+import json
+import base64
+from django.core.exceptions import ValidationError
+from django.db.models import Field, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+class Row(Func):
+    function = 'ROW'
+    output_field = Field()
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique composite ordering, (username, id) by default.
+    Pages after the first are selected with a row comparison, `(username, id) > (%s, %s)`,
+    so that with a matching index every page is a bounded index range scan, however deep.
+    Views can override the ordering with a `keyset_ordering` attribute; all its fields must
+    sort in the same direction.
+    Views whose rows come from several index ranges can define `get_keyset_branches(queryset)`:
+    each branch is paginated on its own and the pages are merged with UNION ALL.
+    """
+    ordering = ('username', 'id')
+    page_size = 50
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = getattr(view, 'keyset_ordering', self.ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.descending = self.ordering[0].startswith('-')
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+
+        if hasattr(view, 'get_keyset_branches'):
+            branches = [self.page_query(branch, cursor) for branch in view.get_keyset_branches(queryset)]
+            queryset = branches[0].union(*branches[1:], all=True).order_by(*self.ordering)[:self.page_size + 1]
+        else:
+            queryset = self.page_query(queryset, cursor)
+
+        page = list(queryset)
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def page_query(self, queryset, cursor):
+        queryset = queryset.order_by(*self.ordering)
+        if cursor is not None:
+            lookup = 'keyset__lt' if self.descending else 'keyset__gt'
+            queryset = queryset.alias(keyset=Row(*self.fields)).filter(**{lookup: Row(*map(Value, cursor))})
+        return queryset[:self.page_size + 1]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if not isinstance(cursor, list) or len(cursor) != len(self.fields):
+                raise ValueError
+            return [model._meta.get_field(field).to_python(value) for field, value in zip(self.fields, cursor)]
+        except (TypeError, ValueError, UnicodeEncodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item):
+        cursor = [getattr(item, field) for field in self.fields]
+        return base64.urlsafe_b64encode(json.dumps(cursor, default=str).encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,27 @@
+import redis
+import redis.asyncio
+from django.conf import settings
+
+"""
+
+Shared Redis clients for application data (settings.REDIS_URL).
+The channel layer keeps its own connections.
+
+"""
+
+_sync_client = None
+_async_client = None
+
+def get_redis():
+    """Client for synchronous code: views, signals and management commands."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _sync_client
+
+def get_async_redis():
+    """Client for consumers and tasks running on the ASGI event loop."""
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _async_client
@@ -104,17 +104,40 @@ HEALTH_CHECK = {
 
 ASGI_APPLICATION = 'app.asgi.application'
 
+REDIS_SERVER_URL = f'redis://:{vault_client.get_redis_vars("password")}@{vault_client.get_redis_vars("host")}:{vault_client.get_redis_vars("port")}'
+
+# Application data (presence, ...) lives in its own database, apart from the channel layer
+REDIS_URL = f'{REDIS_SERVER_URL}/1'
+
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
-            'hosts': [f'redis://:{vault_client.get_redis_vars("password")}@{vault_client.get_redis_vars("host")}:{vault_client.get_redis_vars("port")}/0'],
+            'hosts': [f'{REDIS_SERVER_URL}/0'],
             'capacity': 1500,
             'expiry': 5,
         },
     },
 }
 
+# WebSocket authentication
+WS_USER_CACHE_TTL = config('WS_USER_CACHE_TTL', default=30, cast=int)
+WS_USER_CACHE_SIZE = config('WS_USER_CACHE_SIZE', default=4096, cast=int)
+
+# Presence
+PRESENCE_TTL = config('PRESENCE_TTL', default=60, cast=int)
+PRESENCE_FLUSH_INTERVAL = config('PRESENCE_FLUSH_INTERVAL', default=2, cast=float)
+
+# Tournaments
+# Longer than a tournament may last (see expire_tournaments)
+TOURNAMENT_READY_TTL = config('TOURNAMENT_READY_TTL', default=7200, cast=int)
+TOURNAMENT_SNAPSHOT_TTL = config('TOURNAMENT_SNAPSHOT_TTL', default=600, cast=int)
+
+# Game loop
+GAME_TICK_RATE = config('GAME_TICK_RATE', default=60, cast=int)
+GAME_BROADCAST_RATE = config('GAME_BROADCAST_RATE', default=20, cast=int)
+GAME_PHYSICS_BACKEND = config('GAME_PHYSICS_BACKEND', default='python')
+
 MIDDLEWARE = [
     'django_prometheus.middleware.PrometheusBeforeMiddleware',
     'django.middleware.security.SecurityMiddleware',
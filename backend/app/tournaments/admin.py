@@ -1,4 +1,5 @@
 from django.contrib import admin
-from app.tournaments.models import Tournament
+from app.tournaments.models import Tournament, BracketSlot
 
 admin.site.register(Tournament)
+admin.site.register(BracketSlot)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from app.redis_client import get_async_redis
+
+BARRIER_KEY = "tournament:{}:ready:{}"
+
+# Marks the connection ARGV[3] of player ARGV[2] ready and, if every player in ARGV[4..] has a
+# ready connection, releases the barrier by deleting it. The check and the delete are one step,
+# so exactly one caller sees the release.
+READY = """
+redis.call('SADD', KEYS[1], ARGV[2] .. '|' .. ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+local ready = {}
+for _, member in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    ready[string.match(member, '^([^|]*)|')] = true
+end
+for i = 4, #ARGV do
+    if not ready[ARGV[i]] then
+        return 0
+    end
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+class ReadyBarrier:
+    """
+    Ready checks of the players of tournament games, in one Redis set per (tournament, game)
+    shared by every ASGI process. Readiness is kept per connection (channel name), so a player
+    with several tabs open stays ready until the game starts or every ready TournamentConsumer
+    of theirs disconnects (leave()), however long the opponent takes to finish the previous
+    round. TOURNAMENT_READY_TTL, longer than a tournament may last, only cleans up
+    sets whose cleanup was missed, e.g. when a worker crashed.
+    """
+    def __init__(self):
+        self._ready = None
+
+    async def ready(self, tournament_id, game_id, user_id, channel_name, player_ids):
+        """
+        Returns True for the one call that completes the barrier. A player not known yet (None)
+        keeps it closed, while the readiness of the others is kept.
+        """
+        if self._ready is None:
+            self._ready = get_async_redis().register_script(READY)
+        released = await self._ready(
+            keys=[BARRIER_KEY.format(tournament_id, game_id)],
+            args=[settings.TOURNAMENT_READY_TTL, user_id, channel_name, *('' if player_id is None else player_id for player_id in player_ids)],
+        )
+        return released == 1
+
+    async def leave(self, tournament_id, game_id, user_id, channel_name):
+        await get_async_redis().srem(BARRIER_KEY.format(tournament_id, game_id), f"{user_id}|{channel_name}")
+
+ready_barrier = ReadyBarrier()
@@ -1,9 +1,9 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from app.tournaments.models import Tournament
-from app.games.models import PongGame
-from app.tournaments.serializers import TournamentSerializer
-from django.utils import timezone
+from app.tournaments.matchmaker import MatchMaker
+from app.tournaments.snapshot import get_tournament_snapshot
+from app.tournaments.barrier import ready_barrier
 import json
 
 """
@@ -14,7 +14,7 @@ Handles events related to tournaments created or joined by the current user.
 """
 
 class TournamentConsumer(AsyncWebsocketConsumer):
-    start_messages = {'semifinal_1': set(), 'semifinal_2': set(), 'final': set()}
+    ready_game_id = None
 
     async def connect(self):
         self.user = self.scope["user"]
@@ -34,6 +34,8 @@ class TournamentConsumer(AsyncWebsocketConsumer):
         await self.channel_layer.group_send(self.room_group_name, {"type": "tournament_connected", "user": self.user.id})
 
     async def disconnect(self, close_code):
+        if self.ready_game_id:
+            await ready_barrier.leave(self.tournament_id, self.ready_game_id, self.user.id, self.channel_name)
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
         await self.channel_layer.group_send(self.room_group_name, {"type": "tournament_disconnected", "user": self.user.username})
 
@@ -42,25 +44,23 @@ class TournamentConsumer(AsyncWebsocketConsumer):
             await self.handle_start_message()
 
     async def handle_start_message(self):
-        game_stage = await self.get_game_stage()
-        if not game_stage:
+        current_game = await self.get_current_game()
+        if not current_game:
             return
-        
-        self.start_messages[game_stage].add(self.user.id)
-        participants = await self.get_game_participants(game_stage)
-        
-        if len(participants) == 2 and self.start_messages[game_stage] == set(participants):
-            game_id = await self.get_game_id(game_stage)
+
+        game_id, *participants = current_game
+        self.ready_game_id = game_id
+        if await ready_barrier.ready(self.tournament_id, game_id, self.user.id, self.channel_name, participants):
+            self.ready_game_id = None
             for user_id in participants:
                 await self.channel_layer.group_send(self.room_group_name, {"type": "start_game", "user_id": user_id, "game_id": game_id})
-            self.start_messages[game_stage].clear()
 
     async def endGame(self, event):
-        await self.update_final_game(event)
         await self.send(text_data=json.dumps({"type": "game_over", "game_id": event["game_id"], "tournament": await self.get_tournament_data()}))
 
     async def start_game(self, event):
         if event["user_id"] == self.user.id:
+            self.ready_game_id = None
             await self.send(text_data=json.dumps({"type": "start_game", "game_url": f"/game/{event['game_id']}", "participant_id": event["user_id"]}))
 
     async def tournament_connected(self, event):
@@ -87,71 +87,8 @@ class TournamentConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_tournament_data(self):
-        return TournamentSerializer(Tournament.objects.get(id=self.tournament_id)).data
-
-    @database_sync_to_async
-    def get_game_participants(self, game):
-        game_instance = getattr(self.tournament_db, f"{game}_game", None)
-        if game_instance:
-            player1_id = game_instance.player1.id if game_instance.player1 else None
-            player2_id = game_instance.player2.id if game_instance.player2 else None
-            return [player1_id, player2_id]
-        return []
+        return get_tournament_snapshot(self.tournament_id)
 
     @database_sync_to_async
-    def get_game_id(self, game_type):
-        game_instance = getattr(self.tournament_db, f"{game_type}_game", None)
-        return game_instance.id if game_instance else None
-
-    async def get_game_stage(self):
-        self.tournament_db = await self.get_tournament()
-        if self.user.id in await self.get_game_participants("final"):
-            return "final"
-        for stage in ["semifinal_1", "semifinal_2"]:
-            if self.user.id in await self.get_game_participants(stage):
-                return stage
-        return None
-
-    @database_sync_to_async
-    def update_final_game(self, event):
-        tournament = Tournament.objects.get(id=self.tournament_id)
-        final_game = tournament.final_game
-
-        if event["game_id"] == tournament.semifinal_1_game.id:
-            final_game.player1 = tournament.semifinal_1_game.winner
-        elif event["game_id"] == tournament.semifinal_2_game.id:
-            final_game.player2 = tournament.semifinal_2_game.winner
-        elif event["game_id"] == tournament.final_game.id:
-            tournament.end_date = timezone.now()
-            tournament.save()
-        
-        final_game.save()
-
-"""
-
-Tournament Consumer
-Broadcasts newly created tournaments to all users.
-
-"""
-class OpenTournamentsConsumer(AsyncWebsocketConsumer):
-    async def connect(self):
-        self.group_name = 'open_tournaments'
-        
-        await self.channel_layer.group_add(
-            self.group_name,
-            self.channel_name
-        )
-        
-        await self.accept()
-
-    async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.group_name,
-            self.channel_name
-        )
-    
-    async def tournament_created(self, event):
-        await self.send(text_data=json.dumps({
-            'type': 'tournament_created',
-            'tournament': event['tournament']
-        }))
\ No newline at end of file
+    def get_current_game(self):
+        return MatchMaker.current_game(self.tournament_id, self.user.id)
@@ -1,16 +1,79 @@
 import random
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from app.games.models import PongGame
+from app.tournaments.models import Tournament, BracketSlot
+from app.tournaments.snapshot import invalidate_tournament_snapshot
 
 class MatchMaker:
     @staticmethod
     def create_matches(tournament):
-        participants = list(tournament.participants.all())
-        if len(participants) != 4:
+        """
+        Seeds a single-elimination bracket for a full tournament of 2^k participants.
+        Every game of every round is created upfront, first round games with their players
+        and later ones empty, so advancing a winner is only an update of the next game.
+        """
+        with transaction.atomic():
+            # Serializes the callers seeding the same tournament; only the first one creates games
+            Tournament.objects.select_for_update().get(id=tournament.id)
+            if BracketSlot.objects.filter(tournament=tournament).exists():
+                return
+
+            participants = list(tournament.participants.all())
+            if len(participants) != tournament.participants_amount or len(participants) & (len(participants) - 1):
+                return
+
+            random.shuffle(participants)
+
+            slots = []
+            games_in_round, round = len(participants) // 2, 0
+            while games_in_round:
+                slots += [(round, slot) for slot in range(games_in_round)]
+                games_in_round, round = games_in_round // 2, round + 1
+
+            games = PongGame.objects.bulk_create([
+                PongGame(
+                    player1=participants[2 * slot] if round == 0 else None,
+                    player2=participants[2 * slot + 1] if round == 0 else None,
+                    tournament=tournament,
+                )
+                for round, slot in slots
+            ])
+            BracketSlot.objects.bulk_create([
+                BracketSlot(tournament=tournament, round=round, slot=slot, game=game)
+                for (round, slot), game in zip(slots, games)
+            ])
+
+            # The last three games keep filling the original 4-player fields read by the bracket view
+            tournament.semifinal_1_game, tournament.semifinal_2_game, tournament.final_game = games[-3:]
+            tournament.save(update_fields=['semifinal_1_game', 'semifinal_2_game', 'final_game'])
+
+    @staticmethod
+    def advance(game_id, winner_id):
+        """
+        Moves the winner of a bracket game into its next game, or closes the tournament after
+        the final. Runs in the transaction that saves the result of the game.
+        """
+        bracket_slot = BracketSlot.objects.filter(game_id=game_id).values('tournament_id', 'round', 'slot').first()
+        if not bracket_slot:
             return
 
-        random.shuffle(participants)
+        tournament_id, round, slot = bracket_slot['tournament_id'], bracket_slot['round'], bracket_slot['slot']
+        side = 'player1_id' if slot % 2 == 0 else 'player2_id'
+        advanced = PongGame.objects.filter(
+            bracket_slot__tournament_id=tournament_id, bracket_slot__round=round + 1, bracket_slot__slot=slot // 2
+        ).update(**{side: winner_id})
 
-        tournament.semifinal_1_game = PongGame.objects.create(player1=participants[0], player2=participants[1], tournament=tournament)
-        tournament.semifinal_2_game = PongGame.objects.create(player1=participants[2], player2=participants[3], tournament=tournament)
-        tournament.final_game = PongGame.objects.create(player1=None, player2=None, tournament=tournament)
-        tournament.save()
+        if not advanced:
+            Tournament.objects.filter(id=tournament_id).update(winner_id=winner_id, end_date=timezone.now())
+        transaction.on_commit(lambda: invalidate_tournament_snapshot(tournament_id))
+
+    @staticmethod
+    def current_game(tournament_id, user_id):
+        """Returns the id and players of the unfinished bracket game of a participant, if any."""
+        return PongGame.objects.filter(
+            bracket_slot__tournament_id=tournament_id, winner__isnull=True,
+        ).filter(
+            Q(player1_id=user_id) | Q(player2_id=user_id)
+        ).order_by('bracket_slot__round').values_list('id', 'player1_id', 'player2_id').first()
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_game_and_invitation_indexes'),
+        ('tournaments', '0005_tournament_winner'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tournament',
+            name='participants_amount',
+            field=models.IntegerField(choices=[(4, '4'), (8, '8'), (16, '16'), (32, '32'), (64, '64')]),
+        ),
+        migrations.CreateModel(
+            name='BracketSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.SmallIntegerField()),
+                ('slot', models.SmallIntegerField()),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='bracket_slot', to='games.ponggame')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bracket', to='tournaments.tournament')),
+            ],
+            options={
+                'ordering': ['round', 'slot'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bracketslot',
+            constraint=models.UniqueConstraint(fields=('tournament', 'round', 'slot'), name='bracket_slot_unique'),
+        ),
+    ]
@@ -7,6 +7,10 @@ class Tournament(models.Model):
 
     PARTICIPANTS_AMOUNT_CHOICES = [
         (4, '4'),
+        (8, '8'),
+        (16, '16'),
+        (32, '32'),
+        (64, '64'),
     ]
 
     name = models.CharField(max_length=100)
@@ -20,4 +24,24 @@ class Tournament(models.Model):
     winner = models.ForeignKey(User, related_name='tournaments_won', on_delete=models.CASCADE, null=True)
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class BracketSlot(models.Model):
+    """
+    One game of a single-elimination bracket. Round 0 is the first round and the final
+    is the last one; the winner of (round, slot) plays (round + 1, slot // 2), on the
+    player1 side when slot is even and the player2 side when it is odd.
+    """
+    tournament = models.ForeignKey(Tournament, related_name='bracket', on_delete=models.CASCADE)
+    round = models.SmallIntegerField()
+    slot = models.SmallIntegerField()
+    game = models.OneToOneField('games.PongGame', related_name='bracket_slot', on_delete=models.CASCADE)
+
+    class Meta:
+        ordering = ['round', 'slot']
+        constraints = [
+            models.UniqueConstraint(fields=['tournament', 'round', 'slot'], name='bracket_slot_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.tournament} round {self.round} slot {self.slot}"
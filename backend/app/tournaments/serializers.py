@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from app.tournaments.models import Tournament
+from app.tournaments.models import Tournament, BracketSlot
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from app.users.models import GameStats
 from app.games.serializers import GameStatsSerializer, PongGameSerializer
 from app.users.serializers import AvatarUploadMixin
@@ -18,8 +19,16 @@ class ParticipantSerializer(serializers.ModelSerializer, AvatarUploadMixin):
         representation = super().to_representation(instance)
         return self.add_avatar_upload_path(representation, instance)
 
+class BracketSlotSerializer(serializers.ModelSerializer):
+    game = PongGameSerializer(read_only=True)
+
+    class Meta:
+        model = BracketSlot
+        fields = ['round', 'slot', 'game']
+
 class TournamentSerializer(serializers.ModelSerializer):
     participants = ParticipantSerializer(many=True, read_only=True)
+    bracket = BracketSlotSerializer(many=True, read_only=True)
     semifinal_1_game = PongGameSerializer(read_only=True)
     semifinal_2_game = PongGameSerializer(read_only=True)
     final_game = PongGameSerializer(read_only=True)
@@ -27,11 +36,38 @@ class TournamentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tournament
         fields = '__all__'
-        read_only_fields = ['start_date', 'end_date', 'semifinal_1_game', 'semifinal_2_game', 'final_game', 'winner']
+        read_only_fields = ['start_date', 'end_date', 'semifinal_1_game', 'semifinal_2_game', 'final_game', 'winner', 'bracket']
+
+    @staticmethod
+    def prefetch(queryset):
+        """Loads everything the serializer reads, in three queries for any number of tournaments."""
+        return queryset.select_related(
+            *(f'{game}__{player}' for game in ('semifinal_1_game', 'semifinal_2_game', 'final_game') for player in ('player1', 'player2'))
+        ).prefetch_related(
+            Prefetch('participants', queryset=User.objects.select_related('game_stats')),
+            Prefetch('bracket', queryset=BracketSlot.objects.select_related('game__player1', 'game__player2')),
+        )
 
     def validate(self, data):
         user = self.context['request'].user
         ongoing_tournaments = Tournament.objects.filter(participants=user, end_date__isnull=True).distinct()
         if ongoing_tournaments.exists():
             raise serializers.ValidationError("You are already a participant in an ongoing tournament.")
-        return data
\ No newline at end of file
+        return data
+
+class TournamentListSerializer(serializers.ModelSerializer):
+    """Open tournaments as listed to players looking for one to join; see prefetch()."""
+    participants = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Tournament
+        fields = ['id', 'name', 'start_date', 'participants_amount', 'participants']
+
+    def get_participants(self, tournament):
+        return [{'id': user.id, 'username': user.username} for user in tournament.participants.all()]
+
+    @staticmethod
+    def prefetch(queryset):
+        return queryset.only('id', 'name', 'start_date', 'participants_amount').prefetch_related(
+            Prefetch('participants', queryset=User.objects.only('id', 'username'))
+        )
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+from app.games.models import PongGame
+from .models import Tournament
+from .snapshot import invalidate_tournament_snapshot
+
+def invalidate_on_commit(tournament_id):
+    transaction.on_commit(lambda: invalidate_tournament_snapshot(tournament_id))
+
+@receiver(post_save, sender=Tournament)
+def invalidate_tournament(sender, instance, **kwargs):
+    invalidate_on_commit(instance.id)
+
+@receiver(m2m_changed, sender=Tournament.participants.through)
+def invalidate_tournament_participants(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_on_commit(instance.id)
+        return
+
+    # From the user side (user.tournaments), pk_set holds the tournaments; a clear has none,
+    # so the tournaments are collected before it.
+    if action in ('post_add', 'post_remove'):
+        tournament_ids = pk_set
+    elif action == 'pre_clear':
+        tournament_ids = list(instance.tournaments.values_list('id', flat=True))
+    else:
+        return
+    for tournament_id in tournament_ids:
+        invalidate_on_commit(tournament_id)
+
+@receiver(post_save, sender=PongGame)
+def invalidate_tournament_game(sender, instance, **kwargs):
+    if instance.tournament_id:
+        invalidate_on_commit(instance.tournament_id)
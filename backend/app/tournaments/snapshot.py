@@ -0,0 +1,51 @@
+import json
+from django.conf import settings
+from app.redis_client import get_redis
+from app.tournaments.models import Tournament
+from app.tournaments.serializers import TournamentSerializer
+
+VERSION_KEY = "tournament:{}:version"
+SNAPSHOT_KEY = "tournament:{}:snapshot:{}"
+
+"""
+
+Tournament snapshots
+The serialized tournament sent to its members, cached per (tournament, version) so that
+every TournamentConsumer receiving the same event shares one build. Any change to the
+tournament or its games bumps the version; snapshots of older versions are never read
+again and expire after TOURNAMENT_SNAPSHOT_TTL.
+The version key outlives every snapshot of its tournament (its TTL is refreshed on each
+use), so it cannot restart from 1 while a snapshot of an earlier version 1 is still cached.
+
+"""
+
+def version_ttl():
+    return 2 * settings.TOURNAMENT_SNAPSHOT_TTL
+
+def get_tournament_snapshot(tournament_id):
+    redis = get_redis()
+    version_key = VERSION_KEY.format(tournament_id)
+    with redis.pipeline(transaction=True) as pipe:
+        pipe.set(version_key, 1, nx=True)
+        pipe.expire(version_key, version_ttl())
+        pipe.get(version_key)
+        version = pipe.execute()[-1]
+
+    key = SNAPSHOT_KEY.format(tournament_id, version)
+    snapshot = redis.get(key)
+    if snapshot is not None:
+        return json.loads(snapshot)
+
+    tournament = TournamentSerializer.prefetch(Tournament.objects.filter(id=tournament_id)).first()
+    if tournament is None:
+        return None
+    snapshot = TournamentSerializer(tournament).data
+    redis.set(key, json.dumps(snapshot), ex=settings.TOURNAMENT_SNAPSHOT_TTL)
+    return snapshot
+
+def invalidate_tournament_snapshot(tournament_id):
+    version_key = VERSION_KEY.format(tournament_id)
+    with get_redis().pipeline(transaction=True) as pipe:
+        pipe.incr(version_key)
+        pipe.expire(version_key, version_ttl())
+        pipe.execute()
@@ -1,3 +1,146 @@
-from django.test import TestCase
+import uuid
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+from app.games.models import PongGame
+from app.tournaments.models import Tournament, BracketSlot
+from app.tournaments.matchmaker import MatchMaker
+from app.tournaments.barrier import ready_barrier, BARRIER_KEY
+from app.redis_client import get_redis
+from app.tournaments.views import TournamentListView, CurrentTournamentView
 
-# Create your tests here.
+User = get_user_model()
+
+class TournamentViewTests(TestCase):
+    def setUp(self):
+        self.user = self.create_user("current")
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="password",
+            email_is_verified=True,
+        )
+
+    def get(self, view, url):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=self.user)
+        return view.as_view()(request)
+
+    def create_open_tournaments(self, start, count):
+        for i in range(start, start + count):
+            tournament = Tournament.objects.create(name=f"tournament{i}", participants_amount=8)
+            tournament.participants.add(*(self.create_user(f"t{i}_user{j}") for j in range(i % 4 + 1)))
+
+    def test_list_query_count_does_not_depend_on_tournament_count(self):
+        self.create_open_tournaments(0, 2)
+        with self.assertNumQueries(2):
+            response = self.get(TournamentListView, '/api/tournaments/')
+        self.assertEqual(len(response.data), 2)
+
+        self.create_open_tournaments(2, 8)
+        with self.assertNumQueries(2):
+            response = self.get(TournamentListView, '/api/tournaments/')
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(sorted(len(t['participants']) for t in response.data), sorted(i % 4 + 1 for i in range(10)))
+
+    def test_full_tournaments_are_not_listed(self):
+        tournament = Tournament.objects.create(name="full", participants_amount=4)
+        tournament.participants.add(*(self.create_user(f"user{i}") for i in range(4)))
+
+        response = self.get(TournamentListView, '/api/tournaments/')
+        self.assertEqual(response.data, [])
+
+    def test_current_tournament_query_count_does_not_depend_on_bracket_size(self):
+        for size in (4, 16):
+            Tournament.objects.filter(participants=self.user).update(end_date="2025-01-01T00:00Z")
+            tournament = Tournament.objects.create(name=f"bracket{size}", participants_amount=size)
+            tournament.participants.add(self.user, *(self.create_user(f"b{size}_user{i}") for i in range(size - 1)))
+            MatchMaker.create_matches(tournament)
+
+            with self.assertNumQueries(3):
+                response = self.get(CurrentTournamentView, '/api/tournament/current/')
+            self.assertEqual(response.data['id'], tournament.id)
+            self.assertEqual(len(response.data['participants']), size)
+            self.assertEqual(len(response.data['bracket']), size - 1)
+            self.assertEqual(response.data['final_game']['id'], response.data['bracket'][-1]['game']['id'])
+
+class BracketTests(TestCase):
+    def setUp(self):
+        self.players = [
+            User.objects.create_user(username=f"player{i}", email=f"player{i}@example.com", password="password")
+            for i in range(8)
+        ]
+        self.tournament = Tournament.objects.create(name="bracket", participants_amount=8)
+        self.tournament.participants.add(*self.players)
+        MatchMaker.create_matches(self.tournament)
+
+    def play(self, game, winner_id):
+        PongGame.objects.filter(id=game.id).update(winner_id=winner_id, status='completed')
+        MatchMaker.advance(game.id, winner_id)
+
+    def test_bracket_is_seeded_with_every_player_once(self):
+        slots = list(BracketSlot.objects.filter(tournament=self.tournament).select_related('game'))
+        self.assertEqual([(slot.round, slot.slot) for slot in slots], [(0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 1), (2, 0)])
+
+        first_round = [player for slot in slots if slot.round == 0 for player in (slot.game.player1_id, slot.game.player2_id)]
+        self.assertCountEqual(first_round, [player.id for player in self.players])
+        self.assertTrue(all(slot.game.player1_id is None and slot.game.player2_id is None for slot in slots if slot.round > 0))
+
+    def test_bracket_is_seeded_once(self):
+        final_game_id = self.tournament.final_game_id
+        MatchMaker.create_matches(Tournament.objects.get(id=self.tournament.id))
+
+        self.assertEqual(BracketSlot.objects.filter(tournament=self.tournament).count(), 7)
+        self.assertEqual(PongGame.objects.filter(tournament=self.tournament).count(), 7)
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.final_game_id, final_game_id)
+
+    def test_winners_advance_to_a_tournament_winner(self):
+        for round in range(3):
+            games = PongGame.objects.filter(bracket_slot__tournament=self.tournament, bracket_slot__round=round).order_by('bracket_slot__slot')
+            for game in games:
+                self.assertIsNotNone(game.player1_id)
+                self.assertIsNotNone(game.player2_id)
+                self.assertEqual(MatchMaker.current_game(self.tournament.id, game.player2_id), (game.id, game.player1_id, game.player2_id))
+                self.play(game, game.player2_id)
+            self.tournament.refresh_from_db()
+            self.assertEqual(self.tournament.end_date is not None, round == 2)
+
+            for slot, game in enumerate(games):
+                next_game = PongGame.objects.filter(bracket_slot__tournament=self.tournament, bracket_slot__round=round + 1, bracket_slot__slot=slot // 2).first()
+                if next_game:
+                    self.assertEqual(next_game.player1_id if slot % 2 == 0 else next_game.player2_id, game.player2_id)
+
+        final = self.tournament.final_game
+        self.assertEqual(self.tournament.winner_id, final.player2_id)
+        self.assertIsNone(MatchMaker.current_game(self.tournament.id, final.player2_id))
+
+class ReadyBarrierTests(SimpleTestCase):
+    def setUp(self):
+        self.tournament_id = f"test-{uuid.uuid4()}"
+        self.key = BARRIER_KEY.format(self.tournament_id, 1)
+
+    def tearDown(self):
+        get_redis().delete(self.key, BARRIER_KEY.format(self.tournament_id, 2))
+
+    async def test_readiness_waits_for_an_unknown_opponent_until_disconnect(self):
+        # Ready while the opponent is still playing the previous round
+        self.assertFalse(await ready_barrier.ready(self.tournament_id, 1, 10, "a", [10, None]))
+        self.assertGreater(get_redis().ttl(self.key), 3600)
+
+        # The opponent is known and ready: the barrier releases exactly once
+        self.assertTrue(await ready_barrier.ready(self.tournament_id, 1, 20, "b", [10, 20]))
+        self.assertFalse(await ready_barrier.ready(self.tournament_id, 1, 20, "b", [10, 20]))
+
+        # A disconnected player is no longer ready
+        await ready_barrier.leave(self.tournament_id, 1, 20, "b")
+        self.assertFalse(await ready_barrier.ready(self.tournament_id, 1, 10, "a", [10, 20]))
+        self.assertTrue(await ready_barrier.ready(self.tournament_id, 1, 20, "b", [10, 20]))
+
+        # Closing one of several ready tabs keeps the player ready
+        self.assertFalse(await ready_barrier.ready(self.tournament_id, 2, 10, "tab1", [10, 20]))
+        self.assertFalse(await ready_barrier.ready(self.tournament_id, 2, 10, "tab2", [10, 20]))
+        await ready_barrier.leave(self.tournament_id, 2, 10, "tab1")
+        self.assertTrue(await ready_barrier.ready(self.tournament_id, 2, 20, "c", [10, 20]))
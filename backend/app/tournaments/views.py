@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework.generics import CreateAPIView, RetrieveUpdateAPIView, ListAPIView, RetrieveAPIView
 from django.contrib.auth import get_user_model
 from .models import Tournament
-from .serializers import TournamentSerializer
+from .serializers import TournamentSerializer, TournamentListSerializer
 from app.tournaments.matchmaker import MatchMaker
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -25,7 +25,7 @@ class TournamentCreateView(CreateAPIView):
         self.broadcast_tournament(tournament)
 
     def broadcast_tournament(self, tournament):
-        tournament_data = TournamentSerializer(tournament).data
+        tournament_data = TournamentListSerializer(tournament).data
         
         channel_layer = get_channel_layer()
         
@@ -73,10 +73,12 @@ class TournamentListView(ListAPIView):
     """
     List all open tournaments.
     """
-    queryset = Tournament.objects.filter(end_date__isnull=True).annotate(
-        num_participants=Count("participants")
-    ).filter(num_participants__lt=F("participants_amount"))
-    serializer_class = TournamentSerializer
+    queryset = TournamentListSerializer.prefetch(
+        Tournament.objects.filter(end_date__isnull=True).annotate(
+            num_participants=Count("participants")
+        ).filter(num_participants__lt=F("participants_amount"))
+    )
+    serializer_class = TournamentListSerializer
 
 class CurrentTournamentView(RetrieveAPIView):
     """
@@ -86,7 +88,9 @@ class CurrentTournamentView(RetrieveAPIView):
 
     def get_object(self):
         user = self.request.user
-        return user.get_current_tournament()
+        return TournamentSerializer.prefetch(
+            Tournament.objects.filter(participants=user, end_date__isnull=True)
+        ).first()
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -1,115 +1,81 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
-from app.users.models import UserOnlineStatus
-from channels.db import database_sync_to_async
-from django.utils import timezone
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
+from .presence import presence, presence_group
 
 """
 
-Friend Invitation Consumer
+User Online Status Consumer
 
 """
 
-class FriendInvitationConsumer(AsyncWebsocketConsumer):
+class UserOnlineStatusConsumer(AsyncWebsocketConsumer):
+    """
+    Reports the user's connection to the presence service and receives the batched
+    presence changes of their friends. Clients send a heartbeat every
+    PRESENCE_TTL / 3 seconds to keep the connection counted as online.
+    """
     async def connect(self):
-        self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = f"friend_invitation_{self.room_name}"
-        
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name
-        )
+        self.user = self.scope["user"]
+        if not self.user or not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.group_name = presence_group(self.user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await presence.connect(self.user.id, self.channel_name)
         await self.accept()
-        print(f"Connected to friend room: {self.room_name}, group: {self.room_group_name}")
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.room_group_name,
-            self.channel_name
-        )
-        print(f"Disconnected from friend room: {self.room_name}, group: {self.room_group_name}")
-
-    async def friend_accepted(self, event):
-        friendship = event['friendship']
-        await self.send(text_data=json.dumps({
-            'type': 'friend_accepted',
-            'friendship': friendship
-        }))
-        print(f"Sent friend accepted to room: {self.room_name}, group: {self.room_group_name}")
-
-    async def friend_invited(self, event):
-        friendship = event['friendship']
-        await self.send(text_data=json.dumps({
-            'type': 'friend_invited',
-            'friendship': friendship
-        }))
-        print(f"Sent friend invitation to room: {self.room_name}")
+        if getattr(self, 'user', None) and self.user.is_authenticated:
+            await presence.disconnect(self.user.id, self.channel_name)
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive(self, text_data):
+        data = json.loads(text_data)
+        if data.get("type") == "heartbeat":
+            await presence.heartbeat(self.user.id, self.channel_name)
+
+    async def presence_diff(self, event):
+        await self.send(text_data=json.dumps(event))
 
 
 """
 
-User Online Status Consumer
+Notification Consumer
 
 """
 
-class UserOnlineStatusConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(UserOnlineStatusConsumer):
+    """
+    Single per-user socket multiplexing invitations, friendships, friends' presence and
+    open tournaments. Every event is forwarded as-is; clients route on its `type`.
+    """
     async def connect(self):
         self.user = self.scope["user"]
-        if not self.user.is_authenticated:
+        if not self.user or not self.user.is_authenticated:
             await self.close()
             return
 
-        self.group_name = "online_users"
-        await self.channel_layer.group_add(self.group_name, self.channel_name)
-        
-        await self.set_user_online()
-        
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "online_status",
-                "user_id": self.user.id,
-                "username": self.user.username,
-                "is_online": True,
-                "last_seen": timezone.now().isoformat()
-            }
-        )
-        
-        await self.accept()
+        self.notification_groups = [
+            f"game_invitation_{self.user.id}",
+            f"friend_invitation_{self.user.id}",
+            "open_tournaments",
+        ]
+        for group in self.notification_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
 
-    async def disconnect(self, close_code): # TODO: SOMETIMES MESSAGE IS NOT SENT. RACE CONDITION? THIS MUST BE FIXED
-        if hasattr(self, 'user') and self.user.is_authenticated:
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    "type": "online_status",
-                    "user_id": self.user.id,
-                    "username": self.user.username,
-                    "is_online": False,
-                    "last_seen": timezone.now().isoformat()
-                }
-            )
-            
-            await self.set_user_offline()
-            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await super().connect()
+
+    async def disconnect(self, close_code):
+        await super().disconnect(close_code)
+        for group in getattr(self, 'notification_groups', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
 
-    async def online_status(self, event):
+    async def forward(self, event):
         await self.send(text_data=json.dumps(event))
 
-    @database_sync_to_async
-    def set_user_online(self):
-        UserOnlineStatus.objects.update_or_create(
-            user=self.user,
-            defaults={"is_online": True, "last_seen": timezone.now()}
-        )
-
-    @database_sync_to_async
-    def set_user_offline(self):
-        if User.objects.filter(id=self.user.id).exists():
-            UserOnlineStatus.objects.update_or_create(
-                user=self.user,
-                defaults={"is_online": False, "last_seen": timezone.now()}
-            )
+    game_invited = forward
+    game_accepted = forward
+    friend_invited = forward
+    friend_accepted = forward
+    tournament_created = forward
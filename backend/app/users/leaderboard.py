@@ -0,0 +1,184 @@
+import uuid
+import logging
+import threading
+from django.db import connection
+from django.db.models import Q
+from app.redis_client import get_redis
+from .models import GameStats
+
+logger = logging.getLogger(__name__)
+
+BOARDS = ("wins", "losses", "win_rate")
+BOARD_KEY = "leaderboard:{}"
+# Set by rebuild(): without it the boards were never loaded from GameStats (new Redis, flushed data)
+BUILT_KEY = "leaderboard:built"
+# Held by the one running rebuild; set when a match is recorded while it runs
+REBUILD_LOCK_KEY = "leaderboard:rebuild:lock"
+REBUILD_DIRTY_KEY = "leaderboard:rebuild:dirty"
+REBUILD_LOCK_TTL = 10 * 60 * 1000
+REBUILD_PASSES = 3
+REBUILD_BATCH_SIZE = 5000
+
+# Increments one player's wins or losses and refreshes their win rate, atomically.
+# A result recorded during a rebuild marks it dirty: the rebuild may have read GameStats before
+# this match committed, and its swap would drop the increment.
+# Returns 0 without changes if the boards were never built, as increments would start from 0.
+RECORD_RESULT = """
+if redis.call('EXISTS', KEYS[5]) == 1 then
+    redis.call('SET', KEYS[6], 1)
+end
+if redis.call('EXISTS', KEYS[4]) == 0 then
+    return 0
+end
+local wins = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1]) or 0)
+local losses = tonumber(redis.call('ZSCORE', KEYS[2], ARGV[1]) or 0)
+if ARGV[2] == '1' then wins = wins + 1 else losses = losses + 1 end
+redis.call('ZADD', KEYS[1], wins, ARGV[1])
+redis.call('ZADD', KEYS[2], losses, ARGV[1])
+redis.call('ZADD', KEYS[3], wins / (wins + losses), ARGV[1])
+return 1
+"""
+
+RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def board_key(board):
+    return BOARD_KEY.format(board)
+
+class LeaderboardUnavailable(Exception):
+    """The boards are not built yet; a rebuild has been started."""
+
+class Leaderboard:
+    """
+    Rankings by wins, losses and win rate, kept in one Redis sorted set per board
+    and updated incrementally after each match result commits.
+    Ranks are 1-based, highest score first. Players without finished games are not ranked.
+    GameStats stays the source of truth: rebuild() reloads every board from it. Until the boards
+    are built (new or flushed Redis), reads raise LeaderboardUnavailable and start a rebuild
+    in the background, so a deployment with existing games needs no manual step.
+    """
+    def __init__(self):
+        self._record_result = None
+        self._release_lock = None
+
+    def record_match(self, winner_id, loser_id):
+        """Called on commit of a match result. Errors are logged, not raised: the result is already saved."""
+        try:
+            if self._record_result is None:
+                self._record_result = get_redis().register_script(RECORD_RESULT)
+            keys = [board_key(board) for board in BOARDS] + [BUILT_KEY, REBUILD_LOCK_KEY, REBUILD_DIRTY_KEY]
+            with get_redis().pipeline(transaction=True) as pipe:
+                self._record_result(keys=keys, args=[winner_id, 1], client=pipe)
+                self._record_result(keys=keys, args=[loser_id, 0], client=pipe)
+                recorded = pipe.execute()
+            if not all(recorded):
+                # Called on commit, so the rebuilt boards include this match
+                self.rebuild_in_background()
+        except Exception:
+            logger.exception(f"Failed to update the leaderboard for {winner_id} vs {loser_id}, run rebuild_leaderboard")
+
+    def _check_built(self):
+        if not get_redis().exists(BUILT_KEY):
+            self.rebuild_in_background()
+            raise LeaderboardUnavailable()
+
+    def top(self, board, limit):
+        self._check_built()
+        entries = get_redis().zrevrange(board_key(board), 0, limit - 1, withscores=True)
+        return self._entries(entries, first_rank=1)
+
+    def rank(self, board, user_id):
+        """Returns (rank, score), or (None, None) for unranked players."""
+        self._check_built()
+        with get_redis().pipeline(transaction=False) as pipe:
+            pipe.zrevrank(board_key(board), user_id)
+            pipe.zscore(board_key(board), user_id)
+            rank, score = pipe.execute()
+        if rank is None:
+            return None, None
+        return rank + 1, score
+
+    def around(self, board, user_id, radius):
+        self._check_built()
+        rank = get_redis().zrevrank(board_key(board), user_id)
+        if rank is None:
+            return []
+        start = max(rank - radius, 0)
+        entries = get_redis().zrevrange(board_key(board), start, rank + radius, withscores=True)
+        return self._entries(entries, first_rank=start + 1)
+
+    def _entries(self, entries, first_rank):
+        return [
+            {"rank": first_rank + offset, "user_id": int(member), "score": score}
+            for offset, (member, score) in enumerate(entries)
+        ]
+
+    def rebuild_in_background(self):
+        if get_redis().exists(REBUILD_LOCK_KEY):
+            return
+        threading.Thread(target=self._rebuild_in_thread, daemon=True).start()
+
+    def _rebuild_in_thread(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Failed to rebuild the leaderboards, run rebuild_leaderboard")
+        finally:
+            connection.close()
+
+    def rebuild(self):
+        """
+        Reloads every board from GameStats into temporary keys, then swaps them in at once.
+        Only one rebuild runs at a time: returns None if another one holds the lock, else the
+        number of ranked players. A pass during which a match was recorded is run again.
+        """
+        redis = get_redis()
+        run_id = uuid.uuid4().hex
+        if not redis.set(REBUILD_LOCK_KEY, run_id, nx=True, px=REBUILD_LOCK_TTL):
+            return None
+        try:
+            for _ in range(REBUILD_PASSES):
+                redis.delete(REBUILD_DIRTY_KEY)
+                temporary = {board: f"{board_key(board)}:rebuild:{run_id}" for board in BOARDS}
+                ranked = self._fill(temporary)
+                self._swap(temporary, ranked)
+                if not redis.exists(REBUILD_DIRTY_KEY):
+                    break
+            else:
+                logger.warning(f"Matches kept being recorded during {REBUILD_PASSES} leaderboard rebuild passes, run rebuild_leaderboard")
+            return ranked
+        finally:
+            if self._release_lock is None:
+                self._release_lock = redis.register_script(RELEASE_LOCK)
+            self._release_lock(keys=[REBUILD_LOCK_KEY], args=[run_id])
+
+    def _fill(self, temporary):
+        redis = get_redis()
+        stats = GameStats.objects.filter(Q(wins__gt=0) | Q(losses__gt=0)).values_list("user_id", "wins", "losses")
+        ranked = 0
+        pipe = redis.pipeline(transaction=False)
+        for user_id, wins, losses in stats.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            pipe.zadd(temporary["wins"], {user_id: wins})
+            pipe.zadd(temporary["losses"], {user_id: losses})
+            pipe.zadd(temporary["win_rate"], {user_id: wins / (wins + losses)})
+            ranked += 1
+            if ranked % REBUILD_BATCH_SIZE == 0:
+                pipe.execute()
+        pipe.execute()
+        return ranked
+
+    def _swap(self, temporary, ranked):
+        with get_redis().pipeline(transaction=True) as pipe:
+            for board in BOARDS:
+                if ranked:
+                    pipe.rename(temporary[board], board_key(board))
+                else:
+                    pipe.delete(board_key(board))
+            pipe.set(BUILT_KEY, 1)
+            pipe.execute()
+
+leaderboard = Leaderboard()
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from app.users.leaderboard import leaderboard
+
+class Command(BaseCommand):
+    help = 'Rebuild the Redis leaderboards from GameStats'
+
+    def handle(self, *args, **kwargs):
+        ranked = leaderboard.rebuild()
+        if ranked is None:
+            self.stdout.write(self.style.WARNING('Another rebuild is already running'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Ranked {ranked} players'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from app.users.services import GameStatsService
+from app.users.leaderboard import leaderboard
+
+class Command(BaseCommand):
+    help = 'Rebuild GameStats for every user from the finished games history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **kwargs):
+        updated = GameStatsService.recompute(batch_size=kwargs['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed stats for {updated} users'))
+        ranked = leaderboard.rebuild()
+        if ranked is None:
+            self.stdout.write(self.style.WARNING('A leaderboard rebuild is already running, run rebuild_leaderboard once it is done'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the leaderboards with {ranked} players'))
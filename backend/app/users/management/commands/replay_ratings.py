@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from app.users.services import RatingService
+
+class Command(BaseCommand):
+    help = 'Rebuild every Elo rating and the rating history by replaying the finished games in order. Run it while no games are being played.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **kwargs):
+        replayed = RatingService.replay(batch_size=kwargs['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Replayed {replayed} games'))
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0028_customuser_username_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='friendship',
+            index=models.Index(fields=['sender', 'receiver'], include=('status',), name='friendship_sender_pair_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='friendship',
+            index=models.Index(fields=['receiver', 'sender'], include=('status',), name='friendship_receiver_pair_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_game_and_invitation_indexes'),
+        ('users', '0029_friendship_pair_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamestats',
+            name='rating',
+            field=models.IntegerField(default=1000),
+        ),
+        migrations.CreateModel(
+            name='RatingHistory',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_history', serialize=False, to='games.ponggame')),
+                ('player1_rating', models.SmallIntegerField()),
+                ('player2_rating', models.SmallIntegerField()),
+                ('delta', models.SmallIntegerField()),
+            ],
+        ),
+    ]
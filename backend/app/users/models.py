@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator, MinLengthValidator, EmailValidator, FileExtensionValidator
@@ -47,6 +49,14 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Keyset pagination of the user directory
+            models.Index(fields=['username', 'id'], condition=models.Q(email_is_verified=True), name='user_verified_username_idx'),
+            # Username search (icontains compares UPPER(username))
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='user_username_trgm_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -62,10 +72,26 @@ class GameStats(models.Model):
     total_matches = models.PositiveIntegerField(default=0)
     wins = models.PositiveIntegerField(default=0)
     losses = models.PositiveIntegerField(default=0)
+    rating = models.IntegerField(default=1000)
 
     def __str__(self):
         return f"GameStats for {self.user.username}"
 
+class RatingHistory(models.Model):
+    """Ratings of both players before a game, and the points the winner took from the loser."""
+    game = models.OneToOneField(
+        'games.PongGame',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_history'
+    )
+    player1_rating = models.SmallIntegerField()
+    player2_rating = models.SmallIntegerField()
+    delta = models.SmallIntegerField()
+
+    def __str__(self):
+        return f"Rating change of {self.delta} in game {self.game_id}"
+
 class Friendship(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -89,6 +115,13 @@ class Friendship(models.Model):
         default='pending'
     )
 
+    class Meta:
+        indexes = [
+            # Friendship between two users, looked up in both directions
+            models.Index(fields=['sender', 'receiver'], include=['status'], name='friendship_sender_pair_idx'),
+            models.Index(fields=['receiver', 'sender'], include=['status'], name='friendship_receiver_pair_idx'),
+        ]
+
     def __str__(self):
         return f"{self.sender.username} -> {self.receiver.username} ({self.status})"
 
@@ -0,0 +1,198 @@
+import time
+import asyncio
+import logging
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db.models import Q
+from datetime import datetime, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from app.redis_client import get_redis, get_async_redis
+from .models import Friendship, UserOnlineStatus
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+CONNECTIONS_KEY = "presence:conn:{}"
+ONLINE_KEY = "presence:online"
+DIRTY_KEY = "presence:dirty"
+ONLINE_BITMAP_KEY = "presence:bitmap"
+LAST_SEEN_KEY = "presence:last_seen"
+FLUSH_LOCK_KEY = "presence:flush_lock"
+FLUSH_BATCH_SIZE = 1000
+
+def presence_group(user_id):
+    return f"presence_{user_id}"
+
+class PresenceService:
+    """
+    Online state kept in Redis, shared by every ASGI process.
+    Each user has a sorted set of live connections scored by their expiry, refreshed by client
+    heartbeats, so a connection that never reports its disconnect simply expires after PRESENCE_TTL.
+    Connects, disconnects and expiries only mark the user dirty; a periodic flush (run by one process
+    at a time) works out who actually went online or offline, records it in a bitmap indexed by user id
+    (plus a hash of last-seen times) and in UserOnlineStatus in bulk, and sends each accepted friend
+    one batched `presence_diff` per interval.
+    """
+    def __init__(self):
+        self.task = None
+
+    def _expiry(self):
+        return time.time() + settings.PRESENCE_TTL
+
+    async def connect(self, user_id, channel_name):
+        expiry = self._expiry()
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.zadd(CONNECTIONS_KEY.format(user_id), {channel_name: expiry})
+            pipe.expire(CONNECTIONS_KEY.format(user_id), settings.PRESENCE_TTL * 2)
+            pipe.zadd(ONLINE_KEY, {user_id: expiry})
+            pipe.sadd(DIRTY_KEY, user_id)
+            await pipe.execute()
+        self.ensure_flusher()
+
+    async def heartbeat(self, user_id, channel_name):
+        expiry = self._expiry()
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.zadd(CONNECTIONS_KEY.format(user_id), {channel_name: expiry})
+            pipe.expire(CONNECTIONS_KEY.format(user_id), settings.PRESENCE_TTL * 2)
+            pipe.zadd(ONLINE_KEY, {user_id: expiry})
+            await pipe.execute()
+
+    async def disconnect(self, user_id, channel_name):
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            pipe.zrem(CONNECTIONS_KEY.format(user_id), channel_name)
+            pipe.sadd(DIRTY_KEY, user_id)
+            await pipe.execute()
+
+    def ensure_flusher(self):
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(settings.PRESENCE_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Presence flush failed")
+
+    async def flush(self):
+        redis = get_async_redis()
+        lock_ms = int(settings.PRESENCE_FLUSH_INTERVAL * 1000)
+        if not await redis.set(FLUSH_LOCK_KEY, 1, nx=True, px=lock_ms):
+            return
+
+        now = time.time()
+        expired = await redis.zrangebyscore(ONLINE_KEY, "-inf", now)
+        if expired:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.sadd(DIRTY_KEY, *expired)
+                pipe.zremrangebyscore(ONLINE_KEY, "-inf", now)
+                await pipe.execute()
+
+        while True:
+            dirty = await redis.spop(DIRTY_KEY, FLUSH_BATCH_SIZE)
+            if not dirty:
+                return
+            changes = await self._resolve(redis, [int(user_id) for user_id in dirty], now)
+            if not changes:
+                continue
+            last_seen = time.time()
+            try:
+                await self._publish(changes, last_seen)
+            except Exception:
+                await redis.sadd(DIRTY_KEY, *changes)
+                raise
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id, is_online in changes.items():
+                    pipe.setbit(ONLINE_BITMAP_KEY, user_id, int(is_online))
+                pipe.hset(LAST_SEEN_KEY, mapping={user_id: last_seen for user_id in changes})
+                await pipe.execute()
+
+    async def _resolve(self, redis, user_ids, now):
+        """Returns {user_id: is_online} for the users whose state differs from the last published one."""
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.zremrangebyscore(CONNECTIONS_KEY.format(user_id), "-inf", now)
+                pipe.zcard(CONNECTIONS_KEY.format(user_id))
+            pipe.bitfield_ro(ONLINE_BITMAP_KEY, "u1", user_ids[0], [("u1", user_id) for user_id in user_ids[1:]])
+            results = await pipe.execute()
+        counts, published = results[1:-1:2], results[-1]
+
+        return {
+            user_id: count > 0
+            for user_id, count, previous in zip(user_ids, counts, published)
+            if previous != (count > 0)
+        }
+
+    async def _publish(self, changes, last_seen):
+        diffs = await self._save(changes, datetime.fromtimestamp(last_seen, tz=dt_timezone.utc))
+        channel_layer = get_channel_layer()
+        for recipient, entries in diffs.items():
+            await channel_layer.group_send(presence_group(recipient), {
+                "type": "presence_diff",
+                "changes": entries,
+            })
+
+    @database_sync_to_async
+    def _save(self, changes, last_seen):
+        """Upserts UserOnlineStatus for the changed users and returns the diff entries per friend."""
+        usernames = dict(User.objects.filter(id__in=changes).values_list("id", "username"))
+        UserOnlineStatus.objects.bulk_create(
+            [UserOnlineStatus(user_id=user_id, is_online=changes[user_id], last_seen=last_seen) for user_id in usernames],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["is_online", "last_seen"],
+        )
+
+        entries = {
+            user_id: {
+                "user_id": user_id,
+                "username": username,
+                "is_online": changes[user_id],
+                "last_seen": last_seen.isoformat(),
+            }
+            for user_id, username in usernames.items()
+        }
+        friendships = Friendship.objects.filter(
+            Q(sender_id__in=entries) | Q(receiver_id__in=entries),
+            status="accepted",
+        ).values_list("sender_id", "receiver_id")
+
+        diffs = {}
+        for sender_id, receiver_id in friendships:
+            if sender_id in entries:
+                diffs.setdefault(receiver_id, []).append(entries[sender_id])
+            if receiver_id in entries:
+                diffs.setdefault(sender_id, []).append(entries[receiver_id])
+        return diffs
+
+presence = PresenceService()
+
+def get_presence(user_ids):
+    """
+    Returns the online flag and last-seen time of each user in one Redis round trip.
+    Users the presence store has not seen yet fall back to their UserOnlineStatus row.
+    """
+    if not user_ids:
+        return []
+    with get_redis().pipeline(transaction=False) as pipe:
+        pipe.bitfield_ro(ONLINE_BITMAP_KEY, "u1", user_ids[0], [("u1", user_id) for user_id in user_ids[1:]])
+        pipe.hmget(LAST_SEEN_KEY, user_ids)
+        online, last_seen = pipe.execute()
+
+    statuses = {}
+    for user_id, is_online, seen in zip(user_ids, online, last_seen):
+        if seen is not None:
+            statuses[user_id] = {
+                "user_id": user_id,
+                "is_online": bool(is_online),
+                "last_seen": datetime.fromtimestamp(float(seen), tz=dt_timezone.utc).isoformat(),
+            }
+
+    missing = [user_id for user_id in user_ids if user_id not in statuses]
+    for user_id, is_online, seen in UserOnlineStatus.objects.filter(user_id__in=missing).values_list("user_id", "is_online", "last_seen"):
+        statuses[user_id] = {"user_id": user_id, "is_online": is_online, "last_seen": seen.isoformat()}
+
+    return [statuses[user_id] for user_id in user_ids if user_id in statuses]
@@ -0,0 +1,9 @@
+INITIAL_RATING = 1000
+K_FACTOR = 32
+
+def expected_score(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+def elo_delta(winner_rating, loser_rating, k=K_FACTOR):
+    """Points the winner takes from the loser (Elo), at least one."""
+    return max(1, round(k * (1 - expected_score(winner_rating, loser_rating))))
@@ -1,6 +1,11 @@
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from app.users.models import GameStats, RatingHistory
+from app.users.rating import INITIAL_RATING, elo_delta
+from app.games.models import PongGame
 
 User = get_user_model()
 
@@ -45,4 +50,110 @@ class UserValidationService:
     def validate_two_factor_method(value):
         if value == 'authenticator':
             raise ValidationError("Field can not be updated.")
-        return value
\ No newline at end of file
+        return value
+
+class GameStatsService:
+    """Maintenance operations on GameStats."""
+
+    @staticmethod
+    def _count(queryset):
+        count = queryset.order_by().annotate(count=Func(F('id'), function='COUNT')).values('count')
+        return Coalesce(Subquery(count), Value(0))
+
+    @staticmethod
+    def recompute(batch_size=1000):
+        """
+        Rebuilds every GameStats row from the finished PongGame history.
+        Each batch is a single UPDATE over a range of GameStats ids computed with subqueries,
+        so drift is repaired without loading or locking user rows.
+        """
+        finished = PongGame.objects.filter(status__in=['completed', 'interrupted'], winner__isnull=False)
+        played = finished.filter(Q(player1_id=OuterRef('user_id')) | Q(player2_id=OuterRef('user_id')))
+
+        ids = list(GameStats.objects.order_by('id').values_list('id', flat=True))
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            with transaction.atomic():
+                updated += GameStats.objects.filter(id__gte=batch[0], id__lte=batch[-1]).update(
+                    total_matches=GameStatsService._count(played),
+                    wins=GameStatsService._count(played.filter(winner_id=OuterRef('user_id'))),
+                    losses=GameStatsService._count(played.exclude(winner_id=OuterRef('user_id'))),
+                )
+        return updated
+
+
+class RatingService:
+    """Elo ratings stored on GameStats, with one RatingHistory row per rated game."""
+
+    @staticmethod
+    def rate(game_id, player1_id, player2_id, winner_id):
+        """
+        Rates a finished game and returns the new rating of each player, or None if the game
+        was already rated (a retried save whose first attempt committed).
+        Must run inside the transaction saving the result: both GameStats rows are locked,
+        in user id order so that concurrent games of the same players cannot deadlock.
+        """
+        loser_id = player2_id if winner_id == player1_id else player1_id
+        ratings = dict(
+            GameStats.objects.select_for_update()
+            .filter(user_id__in=[player1_id, player2_id])
+            .order_by('user_id')
+            .values_list('user_id', 'rating')
+        )
+        if RatingHistory.objects.filter(game_id=game_id).exists():
+            return None
+        player1_rating = ratings.get(player1_id, INITIAL_RATING)
+        player2_rating = ratings.get(player2_id, INITIAL_RATING)
+        delta = elo_delta(ratings.get(winner_id, INITIAL_RATING), ratings.get(loser_id, INITIAL_RATING))
+
+        RatingHistory.objects.create(
+            game_id=game_id,
+            player1_rating=player1_rating,
+            player2_rating=player2_rating,
+            delta=delta,
+        )
+        return {
+            winner_id: ratings.get(winner_id, INITIAL_RATING) + delta,
+            loser_id: ratings.get(loser_id, INITIAL_RATING) - delta,
+        }
+
+    @staticmethod
+    def replay(batch_size=2000):
+        """
+        Rebuilds every rating and the whole RatingHistory by replaying the finished games in order.
+        Games are streamed through a server-side cursor and history rows written in batches,
+        so memory only grows with the number of players. Runs in one transaction.
+        """
+        games = PongGame.objects.filter(
+            status__in=['completed', 'interrupted'], winner__isnull=False,
+            player1__isnull=False, player2__isnull=False,
+        ).order_by('date_played', 'id').values_list('id', 'player1_id', 'player2_id', 'winner_id')
+
+        ratings = {}
+        replayed = 0
+        with transaction.atomic():
+            RatingHistory.objects.all().delete()
+            history = []
+            for game_id, player1_id, player2_id, winner_id in games.iterator(chunk_size=batch_size):
+                loser_id = player2_id if winner_id == player1_id else player1_id
+                player1_rating = ratings.get(player1_id, INITIAL_RATING)
+                player2_rating = ratings.get(player2_id, INITIAL_RATING)
+                delta = elo_delta(ratings.get(winner_id, INITIAL_RATING), ratings.get(loser_id, INITIAL_RATING))
+
+                history.append(RatingHistory(game_id=game_id, player1_rating=player1_rating, player2_rating=player2_rating, delta=delta))
+                ratings[winner_id] = ratings.get(winner_id, INITIAL_RATING) + delta
+                ratings[loser_id] = ratings.get(loser_id, INITIAL_RATING) - delta
+                replayed += 1
+                if len(history) >= batch_size:
+                    RatingHistory.objects.bulk_create(history)
+                    history = []
+            RatingHistory.objects.bulk_create(history)
+
+            GameStats.objects.exclude(user_id__in=ratings).update(rating=INITIAL_RATING)
+            stats = [
+                GameStats(id=stats_id, rating=ratings[user_id])
+                for stats_id, user_id in GameStats.objects.filter(user_id__in=ratings).values_list('id', 'user_id')
+            ]
+            GameStats.objects.bulk_update(stats, ['rating'], batch_size=batch_size)
+        return replayed
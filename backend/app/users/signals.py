@@ -1,9 +1,10 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import GameStats
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, post_delete
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from django.contrib.auth import get_user_model
+from app.auth.user_cache import user_cache
 
 User = get_user_model()
 
@@ -11,3 +12,8 @@ User = get_user_model()
 def create_game_stats(sender, instance, created, **kwargs):
     if created:
         GameStats.objects.create(user=instance)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_cache.invalidate_user(instance.id)
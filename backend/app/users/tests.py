@@ -1,3 +1,206 @@
+from unittest import mock
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+from app.redis_client import get_redis
+from app.games.models import PongGame
+from app.users.models import Friendship, GameStats, RatingHistory
+from app.users.rating import INITIAL_RATING, elo_delta
+from app.users.services import RatingService
+from app.users.views import UserListView
+from app.users.leaderboard import leaderboard, LeaderboardUnavailable, BOARDS, BUILT_KEY, REBUILD_LOCK_KEY, REBUILD_DIRTY_KEY, board_key
 
-# Create your tests here.
+User = get_user_model()
+
+class UserListViewTests(TestCase):
+    def setUp(self):
+        self.user = self.create_user("current")
+
+    def create_user(self, username):
+        return User.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="password",
+            email_is_verified=True,
+        )
+
+    def list_users(self, url='/api/users/', **params):
+        request = APIRequestFactory().get(url, params)
+        force_authenticate(request, user=self.user)
+        return UserListView.as_view()(request)
+
+    def create_users(self, start, count):
+        users = [self.create_user(f"user{i}") for i in range(start, start + count)]
+        for i, user in enumerate(users):
+            if i % 2 == 0:
+                Friendship.objects.create(sender=self.user, receiver=user, status='accepted')
+            elif i % 3 == 0:
+                Friendship.objects.create(sender=user, receiver=self.user, status='pending')
+        return users
+
+    def test_query_count_does_not_depend_on_user_count(self):
+        self.create_users(0, 3)
+        with self.assertNumQueries(2):
+            response = self.list_users()
+        self.assertEqual(len(response.data['results']), 4)
+
+        self.create_users(3, 12)
+        with self.assertNumQueries(2):
+            response = self.list_users()
+        self.assertEqual(len(response.data['results']), 16)
+
+    def test_friendship_and_game_stats_are_listed(self):
+        friend, requester, stranger = self.create_users(0, 3)[0], self.create_user("requester"), self.create_user("stranger")
+        Friendship.objects.create(sender=requester, receiver=self.user, status='pending')
+
+        response = self.list_users()
+        users = {user['id']: user for user in response.data['results']}
+
+        self.assertEqual(users[friend.id]['friendship']['status'], 'accepted')
+        self.assertEqual(users[requester.id]['friendship']['sender'], requester.id)
+        self.assertIsNone(users[stranger.id]['friendship'])
+        self.assertEqual(users[friend.id]['game_stats']['total_matches'], 0)
+
+    def test_keyset_pages_cover_every_user_once(self):
+        self.create_users(0, 12)
+        usernames, url, params = [], '/api/users/', {'page_size': 5}
+        while url:
+            response = self.list_users(url, **params)
+            self.assertLessEqual(len(response.data['results']), 5)
+            usernames += [user['username'] for user in response.data['results']]
+            url, params = response.data['next'], {}
+
+        self.assertEqual(usernames, list(User.objects.order_by('username').values_list('username', flat=True)))
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.clear_redis()
+        self.addCleanup(self.clear_redis)
+        # Rebuilds started from other threads would not see the test transaction
+        patcher = mock.patch.object(leaderboard, 'rebuild_in_background')
+        self.rebuild_in_background = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def clear_redis(self):
+        # Leaves the boards unbuilt, so the next real read rebuilds them from the database
+        get_redis().delete(*(board_key(board) for board in BOARDS), BUILT_KEY, REBUILD_LOCK_KEY, REBUILD_DIRTY_KEY)
+
+    def create_player(self, username, wins, losses):
+        user = User.objects.create_user(username=username, email=f"{username}@example.com", password="password")
+        GameStats.objects.filter(user=user).update(wins=wins, losses=losses, total_matches=wins + losses)
+        return user
+
+    def test_reads_are_unavailable_until_the_boards_are_built(self):
+        player = self.create_player("player", 1, 0)
+        for read in (lambda: leaderboard.top("wins", 10), lambda: leaderboard.rank("wins", player.id), lambda: leaderboard.around("wins", player.id, 2)):
+            with self.assertRaises(LeaderboardUnavailable):
+                read()
+        self.rebuild_in_background.assert_called()
+
+    def test_rebuild_loads_every_board_from_game_stats(self):
+        best, middle, worst = self.create_player("best", 5, 0), self.create_player("middle", 3, 3), self.create_player("worst", 0, 4)
+        self.create_player("idle", 0, 0)
+
+        self.assertEqual(leaderboard.rebuild(), 3)
+        self.assertEqual([entry["user_id"] for entry in leaderboard.top("wins", 10)], [best.id, middle.id, worst.id])
+        self.assertEqual(leaderboard.top("losses", 1)[0]["user_id"], worst.id)
+        self.assertEqual(leaderboard.rank("win_rate", middle.id), (2, 0.5))
+        self.assertEqual(leaderboard.rank("wins", User.objects.get(username="idle").id), (None, None))
+        self.assertEqual([entry["rank"] for entry in leaderboard.around("wins", worst.id, 1)], [2, 3])
+
+    def test_record_match_updates_every_board(self):
+        winner, loser = self.create_player("winner", 1, 1), self.create_player("loser", 2, 0)
+        leaderboard.rebuild()
+
+        leaderboard.record_match(winner.id, loser.id)
+        self.assertEqual(leaderboard.rank("wins", winner.id)[1], 2)
+        self.assertEqual(leaderboard.rank("losses", loser.id)[1], 1)
+        self.assertAlmostEqual(leaderboard.rank("win_rate", winner.id)[1], 2 / 3)
+        self.assertAlmostEqual(leaderboard.rank("win_rate", loser.id)[1], 2 / 3)
+
+    def test_record_match_before_build_rebuilds_instead_of_counting_from_zero(self):
+        winner, loser = self.create_player("winner", 4, 0), self.create_player("loser", 0, 4)
+        leaderboard.record_match(winner.id, loser.id)
+
+        self.assertFalse(get_redis().exists(board_key("wins")))
+        self.rebuild_in_background.assert_called_once()
+
+    def test_only_one_rebuild_runs_at_a_time(self):
+        self.create_player("player", 1, 0)
+        get_redis().set(REBUILD_LOCK_KEY, "other")
+        self.assertIsNone(leaderboard.rebuild())
+        self.assertFalse(get_redis().exists(BUILT_KEY))
+
+        get_redis().delete(REBUILD_LOCK_KEY)
+        self.assertEqual(leaderboard.rebuild(), 1)
+        self.assertFalse(get_redis().exists(REBUILD_LOCK_KEY))
+
+    def test_match_recorded_during_a_rebuild_is_not_lost(self):
+        winner, loser = self.create_player("winner", 1, 0), self.create_player("loser", 0, 1)
+        leaderboard.rebuild()
+        swap = leaderboard._swap
+        passes = []
+
+        def swap_after_a_match(temporary, ranked):
+            if not passes:
+                # A match commits after this pass read GameStats
+                GameStats.objects.filter(user=winner).update(wins=2)
+                GameStats.objects.filter(user=loser).update(losses=2)
+                leaderboard.record_match(winner.id, loser.id)
+            passes.append(ranked)
+            swap(temporary, ranked)
+
+        with mock.patch.object(leaderboard, '_swap', side_effect=swap_after_a_match):
+            leaderboard.rebuild()
+
+        self.assertEqual(len(passes), 2)
+        self.assertEqual(leaderboard.rank("wins", winner.id)[1], 2)
+        self.assertEqual(leaderboard.rank("losses", loser.id)[1], 2)
+
+class RatingServiceTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = (
+            User.objects.create_user(username=username, email=f"{username}@example.com", password="password")
+            for username in ("alice", "bob")
+        )
+
+    def play(self, winner, status='completed'):
+        return PongGame.objects.create(player1=self.alice, player2=self.bob, winner=winner, status=status)
+
+    def rating(self, user):
+        return GameStats.objects.get(user=user).rating
+
+    def test_rate_records_the_ratings_before_the_game(self):
+        game = self.play(self.alice)
+        delta = elo_delta(INITIAL_RATING, INITIAL_RATING)
+
+        ratings = RatingService.rate(game.id, self.alice.id, self.bob.id, self.alice.id)
+        self.assertEqual(ratings, {self.alice.id: INITIAL_RATING + delta, self.bob.id: INITIAL_RATING - delta})
+        history = RatingHistory.objects.get(game=game)
+        self.assertEqual((history.player1_rating, history.player2_rating, history.delta), (INITIAL_RATING, INITIAL_RATING, delta))
+
+    def test_rating_a_game_twice_is_a_no_op(self):
+        game = self.play(self.bob)
+        RatingService.rate(game.id, self.alice.id, self.bob.id, self.bob.id)
+
+        self.assertIsNone(RatingService.rate(game.id, self.alice.id, self.bob.id, self.bob.id))
+        self.assertEqual(RatingHistory.objects.filter(game=game).count(), 1)
+
+    def test_replay_rebuilds_ratings_and_history_in_game_order(self):
+        games = [self.play(self.alice), self.play(self.alice), self.play(self.bob, status='interrupted')]
+        self.play(None, status='not_started')
+        GameStats.objects.filter(user=self.alice).update(rating=1500)
+        RatingHistory.objects.create(game=games[0], player1_rating=1500, player2_rating=1500, delta=1)
+
+        ratings = {self.alice.id: INITIAL_RATING, self.bob.id: INITIAL_RATING}
+        deltas = []
+        for game in games:
+            loser_id = self.bob.id if game.winner_id == self.alice.id else self.alice.id
+            deltas.append(elo_delta(ratings[game.winner_id], ratings[loser_id]))
+            ratings[game.winner_id] += deltas[-1]
+            ratings[loser_id] -= deltas[-1]
+
+        self.assertEqual(RatingService.replay(batch_size=2), 3)
+        self.assertEqual(self.rating(self.alice), ratings[self.alice.id])
+        self.assertEqual(self.rating(self.bob), ratings[self.bob.id])
+        self.assertEqual(list(RatingHistory.objects.order_by('game_id').values_list('delta', flat=True)), deltas)
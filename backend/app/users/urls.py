@@ -8,6 +8,10 @@ from app.users.views import (
     FriendsListView,
     OnlineUserListView,
     OnlineStatusListView,
+    PresenceView,
+    LeaderboardView,
+    LeaderboardRankView,
+    LeaderboardAroundView,
 )
 
 urlpatterns = [
@@ -20,4 +24,8 @@ urlpatterns = [
     path('friend-accept/<int:friend_id>', FriendAcceptView.as_view(), name='friend-accept'),
     path('friends/<int:user_id>/', FriendsListView.as_view(), name='friends-list'),
     path('online-status/', OnlineStatusListView.as_view(), name='online-status'),
+    path('presence/', PresenceView.as_view(), name='presence'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('leaderboard/rank/<int:user_id>/', LeaderboardRankView.as_view(), name='leaderboard-rank'),
+    path('leaderboard/around/<int:user_id>/', LeaderboardAroundView.as_view(), name='leaderboard-around'),
 ]
@@ -1,11 +1,11 @@
-from django.db.models import Q
+from django.db.models import Q, F, Case, When, Exists, OuterRef
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated, BasePermission
-from rest_framework.exceptions import  APIException
+from rest_framework.exceptions import  APIException, ValidationError
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
@@ -15,6 +15,10 @@ from asgiref.sync import async_to_sync
 from .serializers import UserSerializer
 from app.games.serializers import UserOnlineStatusSerializer, FriendSerializer, UserListSerializer, FriendshipInvitationSerializer
 from app.users.models import Friendship, UserOnlineStatus
+from app.games.models import GameInvitation
+from app.users.presence import get_presence
+from app.users.leaderboard import leaderboard, BOARDS, LeaderboardUnavailable
+from app.pagination import KeysetPagination
 from app.auth.services import send_verification_email
 import logging
 logger = logging.getLogger(__name__)
@@ -64,10 +68,38 @@ class UserDetailView(CreateAPIView, RetrieveUpdateDestroyAPIView):
 
 class UserListView(ListAPIView):
     """
-    Lists all users, along with Friendship data related to the current user.
+    Lists verified users, along with Friendship data related to the current user, one keyset page at a time.
+    `search` filters by username; `friendship=received` only keeps users with a pending request to the current user.
     """
-    queryset = User.objects.filter(email_is_verified=True)
+    queryset = User.objects.filter(email_is_verified=True).select_related('game_stats')
     serializer_class = UserListSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(username__icontains=search)
+        if self.request.query_params.get('friendship') == 'received':
+            queryset = queryset.filter(friendships_sent__receiver=self.request.user, friendships_sent__status='pending')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        context = {**self.get_serializer_context(), 'friendships': self.get_friendships(request.user, page)}
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
+    def get_friendships(self, user, users):
+        """Maps the ID of each listed user with a Friendship record with the current user to that record."""
+        user_ids = [listed.id for listed in users]
+        friendships = {}
+        for friendship in Friendship.objects.filter(
+            Q(sender=user, receiver_id__in=user_ids) | Q(sender_id__in=user_ids, receiver=user)
+        ).order_by('-id'):
+            other_id = friendship.receiver_id if friendship.sender_id == user.id else friendship.sender_id
+            friendships[other_id] = friendship
+        return friendships
 
 class FriendRequestView(APIView):
     """
@@ -154,7 +186,7 @@ class OnlineUserListView(ListAPIView):
     serializer_class = UserSerializer
 
     def get_queryset(self):
-        online_users = User.objects.filter(online_status__is_online=True)
+        online_users = User.objects.filter(online_status__is_online=True).select_related('game_stats')
         return online_users
     
 class OnlineStatusListView(ListAPIView):
@@ -164,7 +196,24 @@ class OnlineStatusListView(ListAPIView):
     serializer_class = UserOnlineStatusSerializer
 
     def get_queryset(self):
-        return UserOnlineStatus.objects.all()
+        return UserOnlineStatus.objects.select_related('user')
+
+class PresenceView(APIView):
+    """
+    Returns the online flag and last-seen time of the users in `ids` (comma separated), read from the presence store.
+    """
+    MAX_IDS = 500
+
+    def get(self, request):
+        try:
+            user_ids = list(dict.fromkeys(int(user_id) for user_id in request.query_params.get('ids', '').split(',') if user_id))
+            if any(user_id < 1 for user_id in user_ids):
+                raise ValueError
+        except ValueError:
+            return Response({"message": "ids must be a comma separated list of user IDs"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > self.MAX_IDS:
+            return Response({"message": f"At most {self.MAX_IDS} ids can be requested at once"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_presence(user_ids))
     
 class FriendsListView(ListAPIView):
     """
@@ -174,8 +223,74 @@ class FriendsListView(ListAPIView):
 
     def get_queryset(self):
         user_id = self.kwargs.get('user_id')
-        friends = Friendship.objects.filter(
-            Q(sender_id=user_id, status='accepted') | Q(receiver_id=user_id, status='accepted')
-        ).values_list('sender_id', 'receiver_id')
-        friend_ids = [uid for pair in friends for uid in pair if uid != int(user_id)]
-        return User.objects.filter(id__in=friend_ids)
+        accepted = Friendship.objects.filter(status='accepted')
+        return User.objects.filter(
+            Exists(accepted.filter(sender_id=user_id, receiver_id=OuterRef('pk'))) |
+            Exists(accepted.filter(sender_id=OuterRef('pk'), receiver_id=user_id))
+        ).select_related('game_stats')
+
+    def list(self, request, *args, **kwargs):
+        friends = list(self.filter_queryset(self.get_queryset()))
+        context = {**self.get_serializer_context(), 'game_invites': self.get_game_invites(request.user, friends)}
+        serializer = self.get_serializer(friends, many=True, context=context)
+        return Response(serializer.data)
+
+    def get_game_invites(self, user, friends):
+        """Maps the ID of each friend to their latest pending Game Invitation with the current user."""
+        friend_ids = [friend.id for friend in friends]
+        invitations = GameInvitation.objects.filter(
+            Q(sender=user, receiver_id__in=friend_ids) | Q(sender_id__in=friend_ids, receiver=user),
+            status='pending',
+        ).annotate(
+            friend_id=Case(When(sender_id=user.id, then=F('receiver_id')), default=F('sender_id'))
+        ).order_by('friend_id', '-created_at').distinct('friend_id')
+        return {invitation.friend_id: invitation for invitation in invitations}
+
+class LeaderboardMixin:
+    MAX_LIMIT = 100
+    MAX_RADIUS = 25
+
+    def get_board(self):
+        board = self.request.query_params.get('board', 'wins')
+        if board not in BOARDS:
+            raise ValidationError({"message": f"board must be one of {', '.join(BOARDS)}"})
+        return board
+
+    def get_int_param(self, name, default, maximum):
+        try:
+            return max(1, min(int(self.request.query_params.get(name, default)), maximum))
+        except ValueError:
+            raise ValidationError({"message": f"{name} must be an integer"})
+
+    def handle_exception(self, exc):
+        if isinstance(exc, LeaderboardUnavailable):
+            return Response({"message": "The leaderboard is being rebuilt, try again shortly."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return super().handle_exception(exc)
+
+    def with_usernames(self, entries):
+        usernames = dict(User.objects.filter(id__in=[entry['user_id'] for entry in entries]).values_list('id', 'username'))
+        return [{**entry, 'username': usernames.get(entry['user_id'])} for entry in entries]
+
+class LeaderboardView(LeaderboardMixin, APIView):
+    """
+    Returns the top `limit` players of a board (wins, losses or win_rate).
+    """
+    def get(self, request):
+        entries = leaderboard.top(self.get_board(), self.get_int_param('limit', 10, self.MAX_LIMIT))
+        return Response(self.with_usernames(entries))
+
+class LeaderboardRankView(LeaderboardMixin, APIView):
+    """
+    Returns the rank and score of a player on a board. Both are null for players without finished games.
+    """
+    def get(self, request, user_id):
+        rank, score = leaderboard.rank(self.get_board(), user_id)
+        return Response({"user_id": user_id, "rank": rank, "score": score})
+
+class LeaderboardAroundView(LeaderboardMixin, APIView):
+    """
+    Returns the players ranked within `radius` places of a player on a board, the player included.
+    """
+    def get(self, request, user_id):
+        entries = leaderboard.around(self.get_board(), user_id, self.get_int_param('radius', 5, self.MAX_RADIUS))
+        return Response(self.with_usernames(entries))
@@ -2,6 +2,7 @@
 
 python ./manage.py makemigrations 
 python ./manage.py migrate
+python ./manage.py rebuild_leaderboard
 
 env > /etc/environment
 service cron start
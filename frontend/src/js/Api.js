@@ -158,10 +158,12 @@ export class Api {
     /* User lists */
 
     /**
-     * Retrieves a list with all users, along with Friendship data related to the current user.
+     * Retrieves a page of users, along with Friendship data related to the current user.
+     * @param {Object} params - Optional `search`, `cursor` (from the previous page) and `friendship` ("received") filters.
+     * @returns {Promise<Object>} `{ next, results }`
      */
-    async getUsers() {
-        return this.request("get", "/users/");
+    async getUsers(params = {}) {
+        return this.request("get", "/users/", null, { params });
     }
 
     /**
@@ -199,10 +201,11 @@ export class Api {
     /* Online Status */
 
     /**
-     * Lists all online status objects.
+     * Gets the online status of the given users in one request.
+     * @param {Array<number>} userIds - The IDs of the users.
     */
-    async getOnlineStatuses() {
-        return this.request("get", "/online-status/");
+    async getPresence(userIds) {
+        return this.request("get", `/presence/?ids=${userIds.join(",")}`);
     }
 
     /* Games */
@@ -235,12 +238,13 @@ export class Api {
     }
 
     /**
-     * Retrieves a list of results of games played by the user specified by userId.
+     * Retrieves a page of results of games played by the user specified by userId, newest first.
      * @param {string} userId - The ID of the user.
-     * @returns {Promise<Object>} A list of game results.
+     * @param {string} [cursor] - The cursor of the page, taken from the `next` link of the previous one.
+     * @returns {Promise<Object>} `{ next, results }`
     */
-    async getMatchHistory(userId) {
-        return this.request("get", `/match-history/${userId}/`);
+    async getMatchHistory(userId, cursor = undefined) {
+        return this.request("get", `/match-history/${userId}/`, null, { params: { cursor } });
     }
 
     /* Tournaments */
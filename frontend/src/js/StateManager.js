@@ -71,22 +71,33 @@ export class StateManager {
     }
     
     async setInitialOnlineStatuses() {
+        this.updateState('onlineStatuses', new Map());
+    }
+
+    /**
+     * Fetches the online statuses of the given users, e.g. the ones displayed by a page.
+     * Friends' statuses are then kept up to date by presence diffs.
+     *
+     * @param {Array<number>} userIds - The IDs of the users.
+     */
+    async loadOnlineStatuses(userIds) {
+        const ids = [...new Set(userIds)];
+        if (!ids.length) return;
         try {
-            const response = await this.app.api.getOnlineStatuses();
-            const statusesMap = new Map(response.map(user => [user.user_id, user]));
-            this.updateState('onlineStatuses', statusesMap);
+            const statuses = await this.app.api.getPresence(ids);
+            this.updateOnlineStatuses(statuses);
         } catch (error) {
             console.error("Error fetching online status data:", error);
         }
     }
 
-    updateIndividualOnlineStatus(data) {
+    updateOnlineStatuses(changes) {
         if (!this.state.onlineStatuses) return;
 
         const newStatuses = new Map(this.state.onlineStatuses);
-        newStatuses.set(data.user_id, data);
+        changes.forEach(status => newStatuses.set(status.user_id, status));
 
-        this.updateState('onlineStatuses', newStatuses, data.user_id);
+        this.updateState('onlineStatuses', newStatuses, changes.map(status => status.user_id));
     }
 
     async setInitialCurrentTournament() {
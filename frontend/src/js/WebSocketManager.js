@@ -2,19 +2,19 @@ import { settings } from "./settings.js";
 import { showMessage } from "./utils.js";
 
 /**
- * Sets up WebSocket connections for game invitations, friend invitations, online statuses, and tournaments.
+ * Sets up the notification WebSocket, which multiplexes game invitations, friend invitations,
+ * online statuses and open tournaments, and the WebSocket of the current tournament.
  * Handles incoming WebSocket messages and updates the application state accordingly.
  */
 export class WebSocketManager {
     constructor(app) {
         this.app = app;
         this.ws = {
-            gameInvitation: null,
-            friendInvitations: null,
-            onlineStatuses: null,
+            notifications: null,
             currentTournament: null,
-            openTournaments: null,
+            quickMatch: null,
         }
+        this.heartbeat = null;
     }
 
     async init() {
@@ -23,37 +23,59 @@ export class WebSocketManager {
             return;
         }
 
-        const userId = this.app.auth.user.id;
-        this.ws.gameInvitation || this.setupGameInvitationWebSocket(userId);
-        this.ws.friendInvitations || this.setupFriendInvitationWebSocket(userId);
-        this.ws.onlineStatuses || this.setupOnlineStatusWebSocket(userId);
+        this.ws.notifications || this.setupNotificationWebSocket();
         this.ws.currentTournament || this.setupTournamentWebSocket();
-        this.ws.currentTournament || this.setupOpenTournamentsWebSocket();
     }
 
-    setupGameInvitationWebSocket(userId) {
-        this.ws.gameInvitation = this.setupWebSocket(`game-invitation/${userId}`, this.handleGameInvitationMessage.bind(this));
+    setupNotificationWebSocket() {
+        this.ws.notifications = this.setupWebSocket('notifications', 'notifications', this.handleNotificationMessage.bind(this));
+        this.startHeartbeat();
     }
 
-    setupFriendInvitationWebSocket(userId) {
-        this.ws.friendInvitations = this.setupWebSocket(`friend-invitation/${userId}`, this.handleFriendInvitationMessage.bind(this));
+    startHeartbeat() {
+        this.stopHeartbeat();
+        this.heartbeat = setInterval(() => {
+            const ws = this.ws.notifications;
+            if (ws?.readyState === WebSocket.OPEN) {
+                ws.send(JSON.stringify({ type: "heartbeat" }));
+            }
+        }, settings.PRESENCE_HEARTBEAT_INTERVAL);
     }
 
-    setupOnlineStatusWebSocket() {
-        this.ws.onlineStatuses = this.setupWebSocket('online-status', this.handleOnlineStatusMessage.bind(this));
+    stopHeartbeat() {
+        clearInterval(this.heartbeat);
+        this.heartbeat = null;
     }
 
     setupTournamentWebSocket() {
         const tournamentId = this.app.stateManager.state.currentTournament?.id;
         if (!tournamentId) return;
-        this.ws.currentTournament = this.setupWebSocket(`tournament/${tournamentId}`, this.handleTournamentMessage.bind(this), false);
+        this.ws.currentTournament = this.setupWebSocket('currentTournament', `tournament/${tournamentId}`, this.handleTournamentMessage.bind(this), false);
+    }
+
+    startQuickMatch() {
+        this.ws.quickMatch || (this.ws.quickMatch = this.setupWebSocket('quickMatch', 'quick-match', this.handleQuickMatchMessage.bind(this), false));
     }
 
-    setupOpenTournamentsWebSocket() {
-        this.ws.currentTournament = this.setupWebSocket('open-tournaments', this.handleOpenTournamentsMessage.bind(this));
+    stopQuickMatch() {
+        const ws = this.ws.quickMatch;
+        this.ws.quickMatch = null;
+        ws?.close();
     }
 
-    setupWebSocket(path, messageHandler, reconnect = true) {
+    handleQuickMatchMessage(event) {
+        const data = JSON.parse(event.data);
+        if (data.type === "match_found") {
+            this.stopQuickMatch();
+            this.app.navigate(data.game_url);
+        } else if (data.type === "error") {
+            this.stopQuickMatch();
+            this.app.currentPage?.resetQuickMatch?.();
+            showMessage(data.message, "error");
+        }
+    }
+
+    setupWebSocket(key, path, messageHandler, reconnect = true) {
         const ws = new WebSocket(`${settings.WS_URL}/${path}/?token=${this.app.auth.accessToken}`);
         ws.onopen = () => console.log(`WebSocket connection established: ${path}`);
         ws.onmessage = messageHandler;
@@ -63,17 +85,35 @@ export class WebSocketManager {
         ws.onclose = () => {
             console.warn(`WebSocket connection closed: ${path}`);
             setTimeout(() => {
-                if (this.app.auth?.authenticated && reconnect) {
+                if (this.app.auth?.authenticated && reconnect && this.ws[key] === ws) {
                     console.log("Reconnecting...");
-                    this.ws[path] = this.setupWebSocket(path, messageHandler);
+                    this.ws[key] = this.setupWebSocket(key, path, messageHandler, reconnect);
                 }
             }, 3000);
         };
         return ws;
     }
 
-    async handleGameInvitationMessage(event) {
+    handleNotificationMessage(event) {
         const data = JSON.parse(event.data);
+
+        switch (data.type) {
+            case "game_invited":
+            case "game_accepted":
+                return this.handleGameInvitationMessage(data);
+            case "friend_invited":
+            case "friend_accepted":
+                return this.handleFriendInvitationMessage(data);
+            case "presence_diff":
+                return this.handlePresenceDiffMessage(data);
+            case "tournament_created":
+                return this.handleOpenTournamentsMessage(data);
+            default:
+                console.warn("Unknown notification type:", data.type);
+        }
+    }
+
+    async handleGameInvitationMessage(data) {
         if (data.type === "game_accepted") {
             if (this.app.stateManager.state.currentGame) return;
             this.app.navigate(data.game_url);
@@ -90,8 +130,7 @@ export class WebSocketManager {
         }
     }
 
-    async handleFriendInvitationMessage(event) {
-        const data = JSON.parse(event.data);
+    async handleFriendInvitationMessage(data) {
         if (data.type === "friend_invited") {
             if (confirm(`${data.friendship.sender.username} wants to be your friend. Do you accept?`)) {
                 try {
@@ -109,10 +148,9 @@ export class WebSocketManager {
         }
     }
 
-    handleOnlineStatusMessage(event) {
-        const data = JSON.parse(event.data);
-        console.log("Online status WS message:", data);
-        this.app.stateManager.updateIndividualOnlineStatus(data);
+    handlePresenceDiffMessage(data) {
+        console.log("Presence WS message:", data);
+        this.app.stateManager.updateOnlineStatuses(data.changes);
     }
 
     async handleTournamentMessage(event) {
@@ -149,6 +187,10 @@ export class WebSocketManager {
     handleTournamentStartGameMessage(data, auth) {
         if (auth.user.id === data.participant_id) {
             this.app.navigate(data.game_url);
+        } else if (data.type === "error") {
+            this.stopQuickMatch();
+            this.app.currentPage?.resetQuickMatch?.();
+            showMessage(data.message, "error");
         }
     }
 
@@ -159,8 +201,7 @@ export class WebSocketManager {
         }
     }
 
-    handleOpenTournamentsMessage(event) {
-        const data = JSON.parse(event.data);
+    handleOpenTournamentsMessage(data) {
         console.log("Open tournaments WS message:", data);
         data.tournament && this.app.stateManager.updateOpenTournaments(data.tournament);
         
@@ -171,6 +212,7 @@ export class WebSocketManager {
     }
 
     closeConnections() {
+        this.stopHeartbeat();
         Object.keys(this.ws).forEach(key => {
             if (this.ws[key]) {
                 this.ws[key].close();
@@ -2,6 +2,10 @@ import { settings } from "../settings.js";
 import { showMessage } from "../utils.js";
 import Pong from "./Pong.js";
 
+const BINARY_SUBPROTOCOL = "pong.binary.v1";
+const BALL_FIELDS = ["x", "y", "speed_x", "speed_y"];
+const INPUT_OPS = { keydown: 1, keyup: 2, ack: 3, resync: 4 };
+
 class PongRemote extends Pong {
     constructor() {
         super();
@@ -30,11 +34,18 @@ class PongRemote extends Pong {
         this.playersReady = [false, false];
         this.playerSide = null;
         this.inProgress = false;
+        this.resetFrames();
+    }
+
+    resetFrames() {
+        this.frames = new Map();
+        this.lastSeq = 0;
+        this.droppedFrames = 0;
     }
 
     sendPlayerReady() {
         if (this.ws?.readyState === WebSocket.OPEN) {
-            this.ws.send(JSON.stringify({ type: "player_ready" }));
+            this.send({ type: "player_ready" });
             this.readyButton.disabled = true;
             this.readyButton.textContent = "Waiting for opponent...";
         }
@@ -43,11 +54,16 @@ class PongRemote extends Pong {
     setWebsocket(id) {
         this.playersJoined = [false, false];
         this.playersReady = [false, false];
+        this.resetFrames();
 
         this.ws = new WebSocket(
-            `${settings.WS_URL}/${id}/?token=${this.page.app.auth.accessToken}`
+            `${settings.WS_URL}/${id}/?token=${this.page.app.auth.accessToken}`,
+            settings.GAME_BINARY_PROTOCOL ? [BINARY_SUBPROTOCOL] : []
+        );
+        this.ws.binaryType = "arraybuffer";
+        this.ws.onmessage = (event) => this.handleMessage(
+            event.data instanceof ArrayBuffer ? this.decodeGameState(event.data) : JSON.parse(event.data)
         );
-        this.ws.onmessage = (event) => this.handleMessage(JSON.parse(event.data));
         this.ws.onclose = () => this.cleanup();
         this.ws.onerror = (error) => {
             console.error("WebSocket error:", error);
@@ -93,17 +109,20 @@ class PongRemote extends Pong {
                     this.updateStatus("");
                 }
                 break;
-            case "gameState":
+            case "gameState": {
+                const state = this.applyFrame(data);
+                if (!state) break;
                 this.toggleBallDisplay("gameState");
                 this.setPositions({
-                    leftPaddle: { top: `calc(${data.paddles[0].y * 100}%)` },
-                    rightPaddle: { top: `calc(${data.paddles[1].y * 100}%)` },
+                    leftPaddle: { top: `calc(${state.paddles[0].y * 100}%)` },
+                    rightPaddle: { top: `calc(${state.paddles[1].y * 100}%)` },
                     ball: {
-                        top: `calc(${data.ball.y * 100}%)`,
-                        left: `calc(${data.ball.x * 100}%)`,
+                        top: `calc(${state.ball.y * 100}%)`,
+                        left: `calc(${state.ball.x * 100}%)`,
                     },
                 });
                 break;
+            }
             case "score":
                 this.toggleBallDisplay("score");
                 this.player1Score = data.score[0];
@@ -120,6 +139,93 @@ class PongRemote extends Pong {
                 break;
         }
     }
+    /**
+     * Rebuilds the full game state from a keyframe or a delta frame and acknowledges it.
+     * Stale and duplicated frames are ignored, and a delta whose base frame is unknown triggers a resync.
+     * @param {Object} frame - The gameState message.
+     * @returns {Object|null} The full game state, or null if the frame can't be applied.
+     */
+    applyFrame(frame) {
+        if (frame.seq <= this.lastSeq) return null;
+        if (frame.seq > this.lastSeq + 1 && this.lastSeq) {
+            this.droppedFrames += frame.seq - this.lastSeq - 1;
+            console.warn(`Dropped ${frame.seq - this.lastSeq - 1} game frames (${this.droppedFrames} total)`);
+        }
+
+        let state;
+        if (frame.key) {
+            state = { ball: frame.ball, paddles: frame.paddles };
+        } else {
+            const base = this.frames.get(frame.base);
+            if (!base) {
+                this.send({ type: "resync" });
+                return null;
+            }
+            state = {
+                ball: { ...base.ball, ...frame.ball },
+                paddles: base.paddles.map((paddle, i) => frame.paddles?.[i] ?? paddle),
+            };
+        }
+
+        this.lastSeq = frame.seq;
+        this.frames.set(frame.seq, state);
+        for (const seq of this.frames.keys()) {
+            if (seq >= frame.seq - 64) break;
+            this.frames.delete(seq);
+        }
+        this.send({ type: "ack", seq: frame.seq });
+        return state;
+    }
+
+    /**
+     * Decodes a binary gameState frame into the same shape as a JSON frame.
+     * Layout: u8 type | u8 flags | u8 field mask | u32 seq | u32 base | f32 per field in mask.
+     * @param {ArrayBuffer} buffer - The binary frame.
+     * @returns {Object} The gameState message.
+     */
+    decodeGameState(buffer) {
+        const view = new DataView(buffer);
+        const flags = view.getUint8(1);
+        const mask = view.getUint8(2);
+        const frame = { type: "gameState", seq: view.getUint32(3, true), base: view.getUint32(7, true), key: Boolean(flags & 1) };
+        let offset = 11;
+        const next = () => {
+            const value = Math.round(view.getFloat32(offset, true) * 100) / 100;
+            offset += 4;
+            return value;
+        };
+
+        BALL_FIELDS.forEach((field, bit) => {
+            if (mask & (1 << bit)) {
+                frame.ball = frame.ball || {};
+                frame.ball[field] = next();
+            }
+        });
+        const paddles = [0, 1].map(side => (mask & (1 << (BALL_FIELDS.length + side))) ? { y: next() } : null);
+        if (paddles.some(Boolean)) frame.paddles = paddles;
+        return frame;
+    }
+
+    /**
+     * Sends a message to the game server, using the compact binary encoding for input, acks and resyncs when negotiated.
+     * @param {Object} message - The message to send.
+     */
+    send(message) {
+        if (this.ws?.readyState !== WebSocket.OPEN) return;
+        if (this.ws.protocol !== BINARY_SUBPROTOCOL || !(message.type in INPUT_OPS)) {
+            this.ws.send(JSON.stringify(message));
+        } else if (message.type === "ack") {
+            const view = new DataView(new ArrayBuffer(5));
+            view.setUint8(0, INPUT_OPS.ack);
+            view.setUint32(1, message.seq, true);
+            this.ws.send(view.buffer);
+        } else if (message.type === "resync") {
+            this.ws.send(new Uint8Array([INPUT_OPS.resync]));
+        } else {
+            this.ws.send(new Uint8Array([INPUT_OPS[message.type], message.key.charCodeAt(0)]));
+        }
+    }
+
     toggleBallDisplay(message) {
         if (message === "score") {
             this.ball.style.display = "none";
@@ -142,7 +248,7 @@ class PongRemote extends Pong {
     handleKey(event, type) {
         if (this.ws?.readyState === WebSocket.OPEN && ["w", "s", "W", "S"].includes(event.key)) {
             const key = event.key.toLowerCase();
-            this.ws.send(JSON.stringify({ type, key }));
+            this.send({ type, key });
         }
     }
 
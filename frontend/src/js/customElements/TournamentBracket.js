@@ -9,57 +9,67 @@ class TournamentBracket extends BaseElement {
         this.state = {
             tournament: null,
             startButtonEnabled: false,
-            participants: {
-                semi1Player1: null,
-                semi1Player2: null,
-                semi2Player1: null,
-                semi2Player2: null,
-                finalPlayer1: null,
-                finalPlayer2: null
-            }
         };
 
     }
 
     checkIsParticipant(tournament) {
         const { user } = this.page.app.auth;
-        if (!tournament || !user) return false;
-
-        return ['semifinal_1_game', 'semifinal_2_game', 'final_game']
-            .some(gameKey => {
-                const game = tournament[gameKey];
-                return game && 
-                       game.status === "not_started" && 
-                       [game.player1, game.player2].some(player => 
-                           player && player.id === user.id
-                       );
-            });
+        if (!tournament?.bracket || !user) return false;
+
+        return tournament.bracket.some(({ game }) =>
+            game.status === "not_started" &&
+            [game.player1, game.player2].some(player => player && player.id === user.id)
+        );
     }
 
     async setTournament(tournament) {
         const startButtonEnabled = this.checkIsParticipant(tournament);
-        const { semifinal_1_game, semifinal_2_game, final_game } = tournament;
-
-        const participants = {
-            semi1Player1: semifinal_1_game.player1,
-            semi1Player2: semifinal_1_game.player2,
-            semi2Player1: semifinal_2_game.player1,
-            semi2Player2: semifinal_2_game.player2,
-            finalPlayer1: final_game.player1,
-            finalPlayer2: final_game.player2
-        };
-
-        this.setState({ tournament, startButtonEnabled, participants });
+        this.setState({ tournament, startButtonEnabled });
     }
 
     async render() {
         if (!this.page) return;
+        this.renderBracket();
         await this.renderParticipants();
         this.renderGames();
         this.renderStartButton();
         this.renderWinner();
     }
 
+    /**
+     * Lays the rounds out from both sides towards the final in the middle:
+     * the first half of the slots of every round on the left, the second half on the right.
+     */
+    renderBracket() {
+        const bracketEl = this.shadowRoot.querySelector(".tournament-bracket");
+        const bracket = this.state.tournament?.bracket || [];
+        const finalRound = Math.max(0, ...bracket.map(({ round }) => round));
+        const rounds = [...Array(finalRound + 1)].map((_, round) => bracket.filter(entry => entry.round === round));
+
+        const column = (entries, className = "round") =>
+            `<div class="${className}">${entries.map(({ round, slot }) => this.participantTemplate(round, slot)).join("")}</div>`;
+        const left = rounds.slice(0, finalRound).map(entries => column(entries.slice(0, entries.length / 2)));
+        const right = rounds.slice(0, finalRound).map(entries => column(entries.slice(entries.length / 2))).reverse();
+
+        bracketEl.innerHTML = [...left, column(rounds[finalRound] || [], "round final"), ...right].join("");
+    }
+
+    participantTemplate(round, slot) {
+        return `<div class="match">${[1, 2].map(player => `
+            <div class="participant" id="game-${round}-${slot}-player${player}">
+                <div class="avatar">
+                    <img src="${settings.EMPTY_AVATAR_URL}" alt="Player ${player}">
+                </div>
+                <div class="participant-info">
+                    <div class="username">TBD</div>
+                </div>
+                <div class="score">
+                    <span></span>
+                </div>
+            </div>`).join("")}</div>`;
+    }
+
     async renderParticipant(elementId, player) {
         const participantEl = this.shadowRoot.getElementById(elementId);
         if (!participantEl || !player) return;
@@ -85,16 +95,12 @@ class TournamentBracket extends BaseElement {
     }
 
     async renderParticipants() {
-        const { participants } = this.state;
-        
-        await Promise.all([
-            this.renderParticipant("semi1-player1", participants.semi1Player1),
-            this.renderParticipant("semi1-player2", participants.semi1Player2),
-            this.renderParticipant("semi2-player1", participants.semi2Player1),
-            this.renderParticipant("semi2-player2", participants.semi2Player2),
-            this.renderParticipant("final-player1", participants.finalPlayer1),
-            this.renderParticipant("final-player2", participants.finalPlayer2)
-        ]);
+        const bracket = this.state.tournament?.bracket || [];
+
+        await Promise.all(bracket.flatMap(({ round, slot, game }) => [
+            this.renderParticipant(`game-${round}-${slot}-player1`, game.player1),
+            this.renderParticipant(`game-${round}-${slot}-player2`, game.player2),
+        ]));
     }
 
     renderGame(game, type) {
@@ -112,14 +118,8 @@ class TournamentBracket extends BaseElement {
     }
 
     renderGames() {
-        const { tournament } = this.state;
-        if (!tournament) return;
-
-        const { semifinal_1_game, semifinal_2_game, final_game } = tournament;
-        
-        if (semifinal_1_game?.winner) this.renderGame(semifinal_1_game, "semi1");
-        if (semifinal_2_game?.winner) this.renderGame(semifinal_2_game, "semi2");
-        if (final_game?.winner) this.renderGame(final_game, "final");
+        const bracket = this.state.tournament?.bracket || [];
+        bracket.forEach(({ round, slot, game }) => this.renderGame(game, `game-${round}-${slot}`));
     }
 
     renderStartButton() {
@@ -186,6 +186,7 @@ class TournamentBracket extends BaseElement {
                 width: 100%;
                 max-width: 1500px;
                 margin: 0 auto;
+                overflow-x: auto;
             }
 
             .header {
@@ -238,11 +239,20 @@ class TournamentBracket extends BaseElement {
             .round {
                 display: flex;
                 flex-direction: column;
+                justify-content: space-around;
+                align-self: stretch;
                 gap: 60px;
             }
 
-            .final {
+            .match {
+                display: flex;
+                flex-direction: column;
+                gap: 20px;
+            }
+
+            .final .match {
                 flex-direction: row;
+                gap: 60px;
             }
 
             .participant {
@@ -315,85 +325,7 @@ class TournamentBracket extends BaseElement {
                 <h3></h3>
             </div>
             
-            <div class="tournament-bracket">
-                <!-- Left Semifinals -->
-                <div class="round">
-                    <div class="participant" id="semi1-player1">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Player 1">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                        <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                    <div class="participant" id="semi1-player2">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Player 2">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                        <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Finals -->
-                <div class="round final">
-                    <div class="participant" id="final-player1">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Finalist 1">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                        <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                    <div class="participant" id="final-player2">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Finalist 2">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                        <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Right Semifinals -->
-                <div class="round">
-                    <div class="participant" id="semi2-player1">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Player 3">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                                                    <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                    <div class="participant" id="semi2-player2">
-                        <div class="avatar">
-                            <img src="${settings.EMPTY_AVATAR_URL}" alt="Player 4">
-                        </div>
-                        <div class="participant-info">
-                            <div class="username">TBD</div>
-                        </div>
-                        <div class="score">
-                            <span></span>
-                        </div>
-                    </div>
-                </div>
-            </div>
+            <div class="tournament-bracket"></div>
             <div class="start-button-container">
                 <button>START</button>
             </div>
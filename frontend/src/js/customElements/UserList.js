@@ -6,31 +6,45 @@ class UserList extends BaseElement {
         this.attachShadow({ mode: "open" });
         this.setupTemplate();
         this.state = { users: [] };
+        this.loading = false;
+        this.addEventListener("scroll", () => this.handleScroll());
         this._pageSetCallback = () => {
             this.unsubscribe = this.page.app.stateManager.subscribe(
                 'onlineStatuses',
-                (statuses, updatedUserId) => this.handleOnlineStatusUpdate(statuses, updatedUserId)
+                (statuses, updatedUserIds) => this.handleOnlineStatusUpdate(statuses, updatedUserIds)
             );
         };
     }
 
-    handleOnlineStatusUpdate(statuses, updatedUserId) {
-        const userCard = this.shadowRoot.querySelector(`[data-user-id="${updatedUserId}"]`);
-        if (userCard) {
-            const status = statuses.get(updatedUserId);
-            userCard.updateOnlineStatus(status.is_online);
-        }
-        const selectedUser = this.selectedUserCard?.state?.user?.id === updatedUserId;
-        if (selectedUser) {
-            this.selectedUserCard.updateOnlineStatus(statuses.get(updatedUserId));
-        }
+    handleOnlineStatusUpdate(statuses, updatedUserIds = []) {
+        updatedUserIds.forEach(updatedUserId => {
+            const userCard = this.shadowRoot.querySelector(`[data-user-id="${updatedUserId}"]`);
+            if (userCard) {
+                const status = statuses.get(updatedUserId);
+                userCard.updateOnlineStatus(status.is_online);
+            }
+            const selectedUser = this.selectedUserCard?.state?.user?.id === updatedUserId;
+            if (selectedUser) {
+                this.selectedUserCard.updateOnlineStatus(statuses.get(updatedUserId));
+            }
+        });
     }
 
-    set config({ selectedUserCard, actionButton, actionText, actionCallback }) {
+    set config({ selectedUserCard, actionButton, actionText, actionCallback, loadMore }) {
         this.selectedUserCard = selectedUserCard;
         this.actionButton = actionButton;
         this.actionText = actionText;
         this.actionCallback = actionCallback;
+        this.loadMore = loadMore;
+    }
+
+    handleScroll() {
+        if (!this.loadMore || this.loading) return;
+        if (this.scrollTop + this.clientHeight < this.scrollHeight - 50) return;
+        this.loading = true;
+        Promise.resolve(this.loadMore())
+            .catch(error => console.error("Error loading users:", error))
+            .finally(() => this.loading = false);
     }
 
     addUser(user) {
@@ -39,6 +53,11 @@ class UserList extends BaseElement {
         }
     }
 
+    appendUsers(users) {
+        const ids = new Set(this.state.users.map(user => user.id));
+        this.setState({ users: [...this.state.users, ...users.filter(user => !ids.has(user.id))] });
+    }
+
     removeUser(userId) {
         this.setState({ users: this.state.users.filter(user => user.id !== userId) });
     }
@@ -14,26 +14,18 @@ class HomePage extends Page {
 	}
 
 	async render() {
-		const { api, auth } = this.app;
+		const { api } = this.app;
 		const sendList = this.mainElement.querySelector("#send-list");
 		const receiveList = this.mainElement.querySelector("#receive-list");
 		const actionButton = this.mainElement.querySelector("#action-friend");
 		const selectedUserCard = this.mainElement.querySelector("user-profile");
+		const searchInput = this.mainElement.querySelector("#user-search");
 
 		[sendList, receiveList, selectedUserCard].forEach(el => el.page = this);
 		
-		const userLists = await api.getUsers(auth.user.id);
-
-        const sendListData = userLists.filter(user => 
-            user.id !== auth.user.id && 
-            (!user.friendship || 
-            (user.friendship.status === "pending" && user.friendship.sender === auth.user.id))
-        );
-        
-        const receiveListData = userLists.filter(user => 
-            user.friendship?.sender === user.id &&
-            user.friendship.status === "pending"
-        );
+		const receivedPage = await api.getUsers({ friendship: "received" });
+		const receiveListData = receivedPage.results;
+		this.app.stateManager.loadOnlineStatuses(receiveListData.map(user => user.id));
 
 		sendList.config = {
 			selectedUserCard,
@@ -49,10 +41,23 @@ class HomePage extends Page {
 				catch (error) {
 					this.handleError(error);
 				}
-			}
+			},
+			loadMore: () => this.loadSendList(),
 		};
-		sendList.setState ({ users: sendListData });
 		this.sendListElement = sendList;
+		this.userSearch = "";
+		this.sendListCursor = null;
+		this.sendListRequest = 0;
+		await this.loadSendList(true);
+
+		searchInput.value = "";
+		searchInput.oninput = () => {
+			clearTimeout(this.searchTimeout);
+			this.searchTimeout = setTimeout(() => {
+				this.userSearch = searchInput.value.trim();
+				this.loadSendList(true);
+			}, 300);
+		};
 
 		receiveList.config = {
 			selectedUserCard,
@@ -73,6 +78,34 @@ class HomePage extends Page {
 		receiveList.setState ({ users: receiveListData });
 	}
 
+	/**
+	 * Loads the next page of the user directory into the send list, or the first one when reset.
+	 */
+	async loadSendList(reset = false) {
+		const { api, auth, stateManager } = this.app;
+		if (!reset && !this.sendListCursor) return;
+
+		const request = ++this.sendListRequest;
+		const page = await api.getUsers({
+			search: this.userSearch || undefined,
+			cursor: reset ? undefined : this.sendListCursor,
+		});
+		if (request !== this.sendListRequest) return;
+		this.sendListCursor = page.next && new URL(page.next).searchParams.get("cursor");
+
+		const users = page.results.filter(user => 
+			user.id !== auth.user.id && 
+			(!user.friendship || 
+			(user.friendship.status === "pending" && user.friendship.sender === auth.user.id))
+		);
+		stateManager.loadOnlineStatuses(users.map(user => user.id));
+		if (reset) {
+			this.sendListElement.setState({ users });
+		} else {
+			this.sendListElement.appendUsers(users);
+		}
+	}
+
 	handleError(error) {
 		showMessage(error?.response?.data?.message, "error");
         this.close();
@@ -21,10 +21,14 @@ class OnlinePvpPage extends Page {
         const receiveList = this.mainElement.querySelector("#receive-list");
         const actionButton = this.mainElement.querySelector("#action-friend");
         const selectedUserCard = this.mainElement.querySelector("user-profile");
+        const quickMatchButton = this.mainElement.querySelector("#quick-match");
 
         [sendList, receiveList, selectedUserCard].forEach(el => (el.page = this));
 
+        quickMatchButton.addEventListener("click", () => this.toggleQuickMatch(quickMatchButton));
+
         const friendList = await api.getFriends(auth.user.id);
+        stateManager.loadOnlineStatuses(friendList.map(user => user.id));
 
         const sendListData = friendList.filter(user =>
             !user.game_invite || user.game_invite.sender === auth.user.id
@@ -72,6 +76,27 @@ class OnlinePvpPage extends Page {
         receiveList.setState({ users: receiveListData });
     }
 
+    toggleQuickMatch(button) {
+        const { wsManager } = this.app;
+        if (wsManager.ws.quickMatch) {
+            wsManager.stopQuickMatch();
+            button.textContent = "Quick match";
+        } else {
+            wsManager.startQuickMatch();
+            button.textContent = "Searching... (cancel)";
+        }
+    }
+
+    resetQuickMatch() {
+        const button = this.mainElement.querySelector("#quick-match");
+        if (button) button.textContent = "Quick match";
+    }
+
+    close() {
+        this.app.wsManager.stopQuickMatch();
+        super.close();
+    }
+
     handleError(error) {
         showMessage(error?.response?.data?.message, "error");
         this.close();
@@ -28,6 +28,34 @@ class ProfilePage extends Page {
         return matchItem;
     }
 
+    /**
+     * Appends a page of match history, followed by a button loading the next page if any.
+     */
+    appendMatchHistory(matchHistoryEl, profileId, page) {
+        page.results.forEach(match => matchHistoryEl.appendChild(this.createMatchItem(match)));
+        if (!page.next) return;
+
+        const moreItem = document.createElement("li");
+        moreItem.className = "list-group-item text-center";
+        const moreButton = document.createElement("button");
+        moreButton.className = "btn btn-link";
+        moreButton.textContent = "Show more";
+        moreButton.addEventListener("click", async () => {
+            moreButton.disabled = true;
+            try {
+                const cursor = new URL(page.next).searchParams.get("cursor");
+                const nextPage = await this.app.api.getMatchHistory(profileId, cursor);
+                moreItem.remove();
+                this.appendMatchHistory(matchHistoryEl, profileId, nextPage);
+            } catch (error) {
+                console.error("Error loading match history:", error);
+                moreButton.disabled = false;
+            }
+        });
+        moreItem.appendChild(moreButton);
+        matchHistoryEl.appendChild(moreItem);
+    }
+
     async render() {
         const { api, auth } = this.app;
         const { params } = this;
@@ -45,20 +73,17 @@ class ProfilePage extends Page {
 
         const userProfile = await api.getProfile(profileId);
         const matchHistory = await api.getMatchHistory(profileId);
-        matchHistory.sort((a, b) => new Date(b.date_played) - new Date(a.date_played));
         const friends = await api.getFriends(profileId);
+        await this.app.stateManager.loadOnlineStatuses([userProfile.id, ...friends.map(user => user.id)]);
 
         UserProfileCard.setState({user: userProfile});
         pageTitle.textContent = profileId == auth.user.id ? "Your Profile" : capitalizeFirstLetter(userProfile.username) + "'s profile";
         userJoinedEl.textContent = "joined: " + formatDate(userProfile.date_joined);
 
-        if (matchHistory.length === 0) {
+        if (matchHistory.results.length === 0) {
             matchHistoryEl.textContent = "No matches played yet";
         } else {
-            matchHistory.forEach(match => {
-                const matchItem = this.createMatchItem(match);
-                matchHistoryEl.appendChild(matchItem);
-            });
+            this.appendMatchHistory(matchHistoryEl, profileId, matchHistory);
         }
 
         if (friends.length > 0) {
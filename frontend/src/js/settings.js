@@ -6,12 +6,20 @@ const WS_URL = `wss://localhost/ws`;
 
 const DEBUG = process.env.NODE_ENV !== 'production';
 
+// Opt-in: JSON stays the default game protocol
+const GAME_BINARY_PROTOCOL = false;
+
+// Must stay below a third of the backend PRESENCE_TTL
+const PRESENCE_HEARTBEAT_INTERVAL = 15000;
+
 export const settings = {
     "EMPTY_AVATAR_URL": EMPTY_AVATAR_URL,
     "API_URL": API_URL,
     "MEDIA_URL": MEDIA_URL,
     "WS_URL": WS_URL,
     "DEBUG": DEBUG,
+    "GAME_BINARY_PROTOCOL": GAME_BINARY_PROTOCOL,
+    "PRESENCE_HEARTBEAT_INTERVAL": PRESENCE_HEARTBEAT_INTERVAL,
 };
 
 if (!DEBUG) {